@@ -0,0 +1,57 @@
+# benchmarks/keyword_matching.py
+#
+# Compare the Aho-Corasick keyword matcher with the old per-keyword substring
+# scan on the sample resumes in assets/.
+#
+#   python -m benchmarks.keyword_matching [--repeat 200]
+import argparse
+import os
+import timeit
+
+from services.candidate_service import KEYWORD_MATCHER, TECH_KEYWORDS
+from master import extract_text
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+
+def legacy_extract_keywords(text: str):
+    # previous implementation: one lowercase + substring scan per keyword
+    return [kw for kw in TECH_KEYWORDS if kw.lower() in text.lower()]
+
+
+def load_resumes():
+    resumes = {}
+    for name in sorted(os.listdir(ASSETS_DIR)):
+        try:
+            text = extract_text(os.path.join(ASSETS_DIR, name))
+        except Exception as e:  # e.g. tesseract not installed for image resumes
+            print(f"skipping {name}: {e}")
+            continue
+        if text and text != "Unsupported file format.":
+            resumes[name] = text
+    return resumes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for name, text in load_resumes().items():
+        legacy = timeit.timeit(lambda: legacy_extract_keywords(text), number=args.repeat)
+        automaton = timeit.timeit(lambda: KEYWORD_MATCHER.extract(text), number=args.repeat)
+
+        old_found = set(legacy_extract_keywords(text))
+        new_found = set(KEYWORD_MATCHER.extract(text))
+
+        print(f"{name} ({len(text)} chars)")
+        print(f"  legacy    : {legacy / args.repeat * 1e3:.3f} ms/resume, {len(old_found)} keywords")
+        print(f"  automaton : {automaton / args.repeat * 1e3:.3f} ms/resume, {len(new_found)} keywords")
+        if old_found - new_found:
+            print(f"  dropped (substring false matches): {sorted(old_found - new_found)}")
+        if new_found - old_found:
+            print(f"  added: {sorted(new_found - old_found)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/load_test.py
+#
+# Concurrency ceiling of the sync (threadpool) and async (AsyncSession) stacks.
+# Starts uvicorn once per mode against the same database, seeds a job with
+# candidates, then fires requests at increasing concurrency: by default the
+# HR-only GET /candidates/{id} (token check + one lookup), or the public
+# GET /candidates/list page with --route list.
+#
+#   DATABASE_URL=sqlite:///./loadtest.db python -m benchmarks.load_test --modes sync async
+#   DATABASE_URL=postgresql://... python -m benchmarks.load_test --levels 10 50 200 500
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(mode: str, port: int):
+    env = dict(os.environ, ASYNC_DB_ENABLED="true" if mode == "async" else "false",
+               RESUME_WORKER_CONCURRENCY="1", PASSWORD_HASH_WORKERS="1")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(base_url + "/", timeout=1)
+            return proc, base_url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def seed(base_url: str, candidates: int):
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        def token(email, role):
+            client.post("/auth/register", json={"username": email, "email": email, "password": "pw", "role": role})
+            r = client.post("/auth/login", json={"email": email, "password": "pw"})
+            return {"Authorization": "Bearer " + r.json()["access_token"]}
+
+        hr = token("loadtest-hr@example.com", "HR")
+        cand = token("loadtest-candidate@example.com", "CANDIDATE")
+        job = client.post("/jobs/create-job", headers=hr,
+                          json={"title": "Load test", "description": "python developer", "scoringKeywords": ["python"]})
+        job_id = job.json()["id"]
+        candidate_ids = []
+        for i in range(candidates):
+            r = client.post("/candidates/apply", headers=cand, json={
+                "firstName": "Load", "lastName": str(i), "email": f"loadtest-{job_id}-{i}@example.com", "jobId": job_id
+            })
+            candidate_ids.append(r.json()["id"])
+        return job_id, candidate_ids, hr
+
+
+async def run_level(base_url: str, route: str, seeded, concurrency: int, requests: int):
+    job_id, candidate_ids, hr = seeded
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60, headers=hr) as client:
+        queue = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(candidate_ids[i % len(candidate_ids)])
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                candidate_id = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    if route == "list":
+                        r = await client.get("/candidates/list", params={"jobId": job_id, "limit": 20})
+                    else:
+                        r = await client.get(f"/candidates/{candidate_id}")
+                    if r.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--route", default="candidate", choices=["candidate", "list"])
+    parser.add_argument("--levels", nargs="+", type=int, default=[1, 10, 50, 100, 200])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        proc, base_url = start_server(mode, args.port)
+        try:
+            seeded = seed(base_url, args.candidates)
+            print(f"[{mode}] {args.route}")
+            for level in args.levels:
+                result = asyncio.run(run_level(base_url, args.route, seeded, level, args.requests))
+                print(f"  concurrency {level:4d}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+                      f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
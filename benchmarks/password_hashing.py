@@ -0,0 +1,52 @@
+# benchmarks/password_hashing.py
+#
+# Logins per second (Argon2 verify) with the configured parameters, in-process
+# and through the password hashing process pool.
+#
+#   python -m benchmarks.password_hashing [--logins 200] [--workers N]
+import argparse
+import asyncio
+import os
+import time
+
+from config import settings
+from services import auth_services
+
+
+async def _pool_run(hashed: str, logins: int):
+    await asyncio.gather(*[
+        auth_services.verify_and_update_password_async("correct horse", hashed) for _ in range(logins)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    args = parser.parse_args()
+
+    settings.PASSWORD_HASH_WORKERS = args.workers
+    hashed = auth_services.hash_password("correct horse")
+    print(f"argon2 time_cost={settings.ARGON2_TIME_COST} memory_cost={settings.ARGON2_MEMORY_COST}KiB "
+          f"parallelism={settings.ARGON2_PARALLELISM}, {os.cpu_count()} cpus")
+
+    serial_n = max(1, args.logins // 10)
+    start = time.perf_counter()
+    for _ in range(serial_n):
+        auth_services.verify_password("correct horse", hashed)
+    serial = serial_n / (time.perf_counter() - start)
+    print(f"  in-process      : {serial:8.1f} logins/s (1 core)")
+
+    # warm the pool up so process start-up isn't counted
+    asyncio.run(_pool_run(hashed, args.workers))
+    start = time.perf_counter()
+    asyncio.run(_pool_run(hashed, args.logins))
+    pooled = args.logins / (time.perf_counter() - start)
+    print(f"  process pool    : {pooled:8.1f} logins/s ({args.workers} workers, "
+          f"{pooled / args.workers:.1f} per worker)")
+
+    auth_services.shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    main()
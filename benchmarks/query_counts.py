@@ -0,0 +1,121 @@
+# benchmarks/query_counts.py
+#
+# SQL statements issued per request by the main routes, plus the scoring path
+# used by the resume worker. Runs the app in-process against a scratch SQLite
+# database; `--check` fails when a route goes over its budget below.
+#
+#   python -m benchmarks.query_counts [--check]
+import argparse
+import os
+import sys
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="querycount-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/querycount.db")
+os.environ.setdefault("RESUME_WORKER_CONCURRENCY", "1")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "1")
+os.environ.setdefault("QUERY_COUNT_ENABLED", "true")
+
+from fastapi.testclient import TestClient
+
+from database import SessionLocal
+from main import app
+from model import models
+from services import candidate_service
+from services.scoring_service import scoring_config_cache
+from services.tfidf_index import tfidf_index
+from utils.query_counter import count_queries, route_query_stats
+from utils.resume_features import extract_features
+
+# statements per request we expect to stay within
+BUDGETS = {
+    "POST /jobs/create-job": 3,
+    "GET /jobs/get-jobs": 1,
+    "POST /auth/register": 3,
+    "POST /auth/login": 1,
+    "POST /candidates/apply": 4,
+    "GET /candidates/list": 1,
+    "GET /candidates/{candidate_id}": 1,
+    "PATCH /candidates/{candidate_id}": 3,
+    "GET /jobs/{job_id}/top": 3,
+    "calculate_resume_score": 2,
+}
+
+
+def exercise(client: TestClient, candidates: int):
+    def token(email, role):
+        client.post("/auth/register", json={"username": email, "email": email, "password": "pw", "role": role})
+        r = client.post("/auth/login", json={"email": email, "password": "pw"})
+        return {"Authorization": "Bearer " + r.json()["access_token"]}
+
+    hr = token("querycount-hr@example.com", "HR")
+    cand = token("querycount-candidate@example.com", "CANDIDATE")
+    job_id = client.post("/jobs/create-job", headers=hr, json={
+        "title": "Backend engineer", "description": "python fastapi postgresql developer",
+        "scoringKeywords": ["python", "fastapi", "postgresql"],
+    }).json()["id"]
+    client.get("/jobs/get-jobs")
+
+    ids = []
+    for i in range(candidates):
+        r = client.post("/candidates/apply", headers=cand, json={
+            "firstName": "Query", "lastName": str(i), "email": f"querycount-{job_id}-{i}@example.com", "jobId": job_id
+        })
+        ids.append(r.json()["id"])
+
+    with SessionLocal() as db:
+        text = "5 years python and fastapi developer"
+        db.add_all(models.ResumeParsed(candidateId=cid, text=text, keywords=["python", "fastapi"],
+                                       **extract_features(text)) for cid in ids)
+        db.commit()
+        # count steady-state scoring, not the one-off index fit / weights load
+        tfidf_index.ensure_fitted(db)
+        scoring_config_cache.get(db)
+        scoring = []
+        for cid in ids:
+            with count_queries() as q:
+                candidate_service.calculate_resume_score(cid, db)
+            scoring.append(q.count)
+
+    client.get("/candidates/list", params={"jobId": job_id, "limit": 20})
+    for cid in ids[:5]:
+        client.get(f"/candidates/{cid}", headers=hr)
+        client.patch(f"/candidates/{cid}", json={"status": "screened"})
+    client.get(f"/jobs/{job_id}/top", params={"k": 10}, headers=hr)
+    client.get(f"/jobs/{job_id}/top", params={"k": 10}, headers=hr)
+    return scoring
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="exit non-zero when a route exceeds its budget")
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        route_query_stats.reset()
+        scoring = exercise(client, args.candidates)
+
+    report = route_query_stats.report()
+    report["calculate_resume_score"] = {
+        "requests": len(scoring), "queries_total": sum(scoring),
+        "queries_avg": round(sum(scoring) / len(scoring), 2), "queries_max": max(scoring),
+    }
+
+    over = []
+    print(f"{'route':40s} {'requests':>8s} {'avg':>6s} {'max':>5s} {'budget':>6s}")
+    for route, stats in report.items():
+        budget = BUDGETS.get(route)
+        flag = ""
+        if budget is not None and stats["queries_max"] > budget:
+            over.append(route)
+            flag = "  OVER"
+        print(f"{route:40s} {stats['requests']:8d} {stats['queries_avg']:6.2f} {stats['queries_max']:5d} "
+              f"{budget if budget is not None else '-':>6}{flag}")
+
+    if args.check and over:
+        sys.exit(f"over budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/route_checks.py
+#
+# Regression checks for request routing (with the async stack enabled) and
+# upload size limits. Runs the app in-process against a scratch SQLite
+# database and exits non-zero when a check fails.
+#
+#   python -m benchmarks.route_checks
+import os
+import sys
+import tempfile
+
+import anyio
+
+_db_dir = tempfile.mkdtemp(prefix="routecheck-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/routecheck.db")
+os.environ.setdefault("RESUME_WORKER_CONCURRENCY", "1")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "1")
+os.environ["ASYNC_DB_ENABLED"] = "true"
+os.environ.setdefault("RESUME_MAX_UPLOAD_BYTES", str(1024 * 1024))
+
+from fastapi.testclient import TestClient
+
+from config import settings
+from main import app
+
+
+async def asgi_post(path: str, headers: dict, parts: list):
+    """POST `parts` as a chunked body straight to the ASGI app; returns (status, body bytes it read)."""
+    pending, received, status = list(parts), [0], [None]
+
+    async def receive():
+        if not pending:
+            return {"type": "http.disconnect"}
+        body = pending.pop(0)
+        received[0] += len(body)
+        return {"type": "http.request", "body": body, "more_body": bool(pending)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status[0] = message["status"]
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+             "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+             "client": ("127.0.0.1", 1), "server": ("testserver", 80)}
+    await app(scope, receive, send)
+    return status[0], received[0]
+
+
+def token(client: TestClient, email: str, role: str):
+    client.post("/auth/register", json={"username": email, "email": email, "password": "pw", "role": role})
+    r = client.post("/auth/login", json={"email": email, "password": "pw"})
+    return {"Authorization": "Bearer " + r.json()["access_token"]}
+
+
+def check_fixed_paths_not_shadowed(client: TestClient):
+    # the async GET /candidates/{id} is mounted first; it must not swallow these
+    hr = token(client, "routecheck-hr@example.com", "HR")
+    failures = []
+    for path, params in (("/candidates/search", {"q": "python"}), ("/candidates/duplicates", {})):
+        r = client.get(path, params=params, headers=hr)
+        if r.status_code != 200:
+            failures.append(f"GET {path}: {r.status_code} {r.text[:200]}")
+    return failures
+
+
+def check_oversized_upload_rejected(client: TestClient):
+    hr = token(client, "routecheck-hr@example.com", "HR")
+    cand = token(client, "routecheck-candidate@example.com", "CANDIDATE")
+    job_id = client.post("/jobs/create-job", headers=hr, json={
+        "title": "Route check", "description": "python developer", "scoringKeywords": ["python"]}).json()["id"]
+    candidate_id = client.post("/candidates/apply", headers=cand, json={
+        "firstName": "Route", "lastName": "Check", "email": "routecheck-applicant@example.com", "jobId": job_id,
+    }).json()["id"]
+    url = f"/candidates/{candidate_id}/upload-resume-file"
+    failures = []
+
+    # declared size over the limit: answered from the headers alone
+    r = client.post(url, headers={**cand, "Content-Type": "multipart/form-data; boundary=x",
+                                  "Content-Length": str(settings.RESUME_MAX_UPLOAD_BYTES * 4)}, content=b"")
+    if r.status_code != 413:
+        failures.append(f"POST {url} (Content-Length): {r.status_code} {r.text[:200]}")
+
+    # chunked body, driven over raw ASGI (TestClient buffers request bodies):
+    # the app must stop pulling chunks just past the limit, not at the end of the body
+    chunk = b"0" * (64 * 1024)
+    parts = [b'--x\r\nContent-Disposition: form-data; name="file"; filename="r.pdf"\r\n\r\n%PDF-']
+    parts += [chunk] * (settings.RESUME_MAX_UPLOAD_BYTES * 4 // len(chunk)) + [b"\r\n--x--\r\n"]
+    status, received = anyio.run(asgi_post, url, {**cand, "Content-Type": "multipart/form-data; boundary=x"}, parts)
+    if status != 413:
+        failures.append(f"POST {url} (chunked): {status}")
+    if received > settings.RESUME_MAX_UPLOAD_BYTES + 128 * 1024:
+        failures.append(f"POST {url} (chunked): read {received} bytes before rejecting")
+    return failures
+
+
+CHECKS = [check_fixed_paths_not_shadowed, check_oversized_upload_rejected]
+
+
+def main():
+    failures = []
+    with TestClient(app) as client:
+        for check in CHECKS:
+            problems = check(client)
+            print(f"{check.__name__:45s} {'FAIL' if problems else 'ok'}")
+            failures.extend(problems)
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+# benchmarks/scoring_suite.py
+#
+# Benchmark suite for the resume pipeline on synthetic data (benchmarks/synthetic.py):
+#   - microbenchmarks: extract_text per format/size, extract_keywords,
+#     extract_features, utils.scoring.score_resume
+#   - scoring against SQLite: calculate_resume_score per candidate, rescore_job per job
+#   - agreement between the scoring implementations on the same resumes
+#   - end-to-end: upload -> background worker -> parsed + scored, resumes/s
+# Results are written as JSON; pass an earlier file to --compare to spot regressions.
+#
+#   python -m benchmarks.scoring_suite [--quick] [--formats txt pdf docx jpg]
+#   python -m benchmarks.scoring_suite --compare benchmarks/results/<commit>.json
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_work_dir = tempfile.mkdtemp(prefix="scoring-suite-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_work_dir}/suite.db")
+os.environ.setdefault("RESUME_STORE_DIR", os.path.join(_work_dir, "blobs"))
+os.environ.setdefault("OCR_CACHE_DIR", os.path.join(_work_dir, "ocr_cache"))
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "1")
+
+from fastapi.testclient import TestClient
+
+from benchmarks import synthetic
+from database import Base, SessionLocal, engine
+from master import extract_text
+from model import models
+from services import candidate_service, scoring_service
+from services.tfidf_index import tfidf_index
+from utils import scoring as legacy_scoring
+from utils.resume_features import extract_features
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# a slowdown beyond this ratio is reported as a regression by --compare
+REGRESSION_THRESHOLD = 1.10
+
+
+def _time_ms(fn, repeat: int):
+    """Median wall time of one call, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _metric(value, unit, better="lower"):
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+# ---------- microbenchmarks ----------
+def bench_functions(corpus, repeat: int):
+    results = {}
+    texts = {}
+    for path, fmt, size, text in corpus:
+        texts.setdefault(size, text)
+        key = f"extract_text.{fmt}.{size}"
+        if key in results or fmt == "txt":
+            continue
+        try:
+            results[key] = _metric(_time_ms(lambda: extract_text(path), max(1, repeat // 5)), "ms")
+        except Exception as e:  # e.g. tesseract not installed for jpg
+            print(f"  skipping {key}: {e}")
+
+    for size, text in texts.items():
+        results[f"extract_keywords.{size}"] = _metric(_time_ms(lambda: candidate_service.extract_keywords(text), repeat), "ms")
+        results[f"extract_features.{size}"] = _metric(_time_ms(lambda: extract_features(text), repeat), "ms")
+        results[f"score_resume.{size}"] = _metric(_time_ms(lambda: legacy_scoring.score_resume(text, 0), repeat), "ms")
+    return results
+
+
+# ---------- scoring against SQLite ----------
+def _seed_job(db, rng, title, description, keywords, resumes):
+    job = models.Job(title=title, description=description, scoringKeywords=keywords)
+    db.add(job)
+    db.flush()
+    candidates = [models.Candidate(firstName="Bench", lastName=str(i), email=f"bench-{job.id}-{i}@example.com",
+                                   jobId=job.id) for i in range(len(resumes))]
+    db.add_all(candidates)
+    db.flush()
+    for candidate, text in zip(candidates, resumes):
+        db.add(models.ResumeParsed(candidateId=candidate.id, text=text,
+                                   keywords=candidate_service.extract_keywords(text), **extract_features(text)))
+    db.commit()
+    return job.id, [c.id for c in candidates]
+
+
+def bench_scoring(candidates: int, seed: int, repeat: int):
+    rng = random.Random(seed)
+    resumes = [synthetic.generate_resume(rng, rng.choice(["small", "medium"])) for _ in range(candidates)]
+    results, agreement = {}, {}
+
+    with SessionLocal() as db:
+        job_id, ids = _seed_job(db, rng, *synthetic.generate_job(rng), resumes)
+        tfidf_index.fit(db)
+        scoring_service.scoring_config_cache.get(db)
+
+        single = {}
+        samples = []
+        for cid in ids:
+            start = time.perf_counter()
+            single[cid] = candidate_service.calculate_resume_score(cid, db)["score"]
+            samples.append((time.perf_counter() - start) * 1000)
+        results["calculate_resume_score"] = _metric(statistics.median(samples), "ms")
+
+        ranking = scoring_service.rescore_job(job_id, db)["ranking"]
+        elapsed = _time_ms(lambda: scoring_service.rescore_job(job_id, db), max(3, repeat // 5))
+        results["rescore_job.total"] = _metric(elapsed, "ms")
+        results["rescore_job.per_candidate"] = _metric(elapsed / len(ids), "ms")
+
+        bulk = {row["candidate_id"]: row["score"] for row in ranking}
+        agreement["calculate_vs_rescore.max_abs_diff"] = max(abs(single[c] - bulk[c]) for c in ids)
+
+        # the legacy scorer has its job hard-coded; score the same resumes against that job
+        legacy_job = ("Legacy", "Looking for React and NestJS developer with 3+ years experience",
+                      ["react", "nestjs", "developer", "typescript"])
+        legacy_resumes = [r + "\n" + " ".join(rng.sample(legacy_job[2], rng.randint(0, 4))) for r in resumes]
+        legacy_job_id, legacy_ids = _seed_job(db, rng, *legacy_job, legacy_resumes)
+        tfidf_index.fit(db)
+        current = [candidate_service.calculate_resume_score(cid, db)["score"] for cid in legacy_ids]
+        legacy = [legacy_scoring.score_resume(text, cid)[0] for cid, text in zip(legacy_ids, legacy_resumes)]
+        agreement["score_resume_vs_calculate.mean_abs_diff"] = statistics.fmean(
+            abs(a - b) for a, b in zip(current, legacy))
+        agreement["score_resume_vs_calculate.rank_correlation"] = _spearman(current, legacy)
+
+    return results, {k: round(v, 4) for k, v in agreement.items()}
+
+
+def _spearman(a, b):
+    def ranks(values):
+        order = sorted(range(len(values)), key=values.__getitem__)
+        r = [0.0] * len(values)
+        for rank, i in enumerate(order):
+            r[i] = float(rank)
+        return r
+    try:
+        return statistics.correlation(ranks(a), ranks(b))
+    except statistics.StatisticsError:  # constant input
+        return float("nan")
+
+
+# ---------- end to end ----------
+def bench_end_to_end(corpus, timeout: float):
+    """Upload every corpus file through the API and wait until the worker has scored them all."""
+    uploads = [(path, fmt) for path, fmt, _, _ in corpus if fmt in ("pdf", "docx", "jpg")]
+    if not uploads:
+        return {}
+    from main import app
+
+    with TestClient(app) as client:
+        def token(email, role):
+            client.post("/auth/register", json={"username": email, "email": email, "password": "pw", "role": role})
+            r = client.post("/auth/login", json={"email": email, "password": "pw"})
+            return {"Authorization": "Bearer " + r.json()["access_token"]}
+
+        hr = token("suite-hr@example.com", "HR")
+        cand = token("suite-candidate@example.com", "CANDIDATE")
+        title, description, keywords = synthetic.generate_job(random.Random(0))
+        job_id = client.post("/jobs/create-job", headers=hr, json={
+            "title": title, "description": description, "scoringKeywords": keywords}).json()["id"]
+
+        start = time.perf_counter()
+        tasks = []
+        for i, (path, fmt) in enumerate(uploads):
+            cid = client.post("/candidates/apply", headers=cand, json={
+                "firstName": "E2E", "lastName": str(i), "email": f"e2e-{job_id}-{i}@example.com", "jobId": job_id
+            }).json()["id"]
+            with open(path, "rb") as f:
+                r = client.post(f"/candidates/{cid}/upload-resume-file", headers=cand,
+                                files={"file": (os.path.basename(path), f)})
+            tasks.append(r.json()["data"]["task_id"])
+
+        pending, failed = set(tasks), 0
+        deadline = time.monotonic() + timeout
+        while pending and time.monotonic() < deadline:
+            for task_id in list(pending):
+                status = client.get(f"/candidates/resume-tasks/{task_id}", headers=cand).json()["status"]
+                if status in ("done", "failed"):
+                    pending.discard(task_id)
+                    failed += status == "failed"
+            time.sleep(0.1)
+        elapsed = time.perf_counter() - start
+
+    done = len(tasks) - len(pending) - failed
+    return {
+        "end_to_end.resumes_per_s": _metric(done / elapsed, "per_s", better="higher"),
+        "end_to_end.failed": _metric(failed + len(pending), "count"),
+    }
+
+
+# ---------- reporting ----------
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\ncompared with {baseline['meta']['commit']} ({baseline_path})")
+    regressions = []
+    for name, metric in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old or not old["value"] or not metric["value"]:
+            continue
+        ratio = metric["value"] / old["value"]
+        slower = ratio if metric["better"] == "lower" else 1 / ratio
+        flag = "  REGRESSION" if slower > REGRESSION_THRESHOLD else ""
+        if flag:
+            regressions.append(name)
+        print(f"  {name:45s} {old['value']:10.3f} -> {metric['value']:10.3f} {metric['unit']:6s} x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="fewer files and repeats")
+    parser.add_argument("--formats", nargs="+", default=["txt", "pdf", "docx"], choices=list(synthetic.WRITERS))
+    parser.add_argument("--sizes", nargs="+", default=list(synthetic.SIZES), choices=list(synthetic.SIZES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-e2e", action="store_true")
+    parser.add_argument("--out", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    per_size = 2 if args.quick else 5
+    repeat = 5 if args.quick else 30
+    candidates = 50 if args.quick else 300
+
+    Base.metadata.create_all(bind=engine)
+    corpus = synthetic.generate_corpus(os.path.join(_work_dir, "corpus"), per_size, args.sizes, args.formats, args.seed)
+
+    print("microbenchmarks ...")
+    results = bench_functions(corpus, repeat)
+    print("scoring against sqlite ...")
+    scoring_results, agreement = bench_scoring(candidates, args.seed, repeat)
+    results.update(scoring_results)
+    if not args.skip_e2e:
+        print("end to end ...")
+        results.update(bench_end_to_end(corpus, timeout=600))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+        "agreement": agreement,
+    }
+
+    for name, metric in results.items():
+        print(f"  {name:45s} {metric['value']:10.3f} {metric['unit']}")
+    for name, value in agreement.items():
+        print(f"  {name:45s} {value:10.4f}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {out}")
+
+    if args.compare and compare(report, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# benchmarks/synthetic.py
+#
+# Synthetic resumes and job descriptions for the benchmarks, written in the
+# formats we accept (see assets/): plain text, PDF, DOCX and a scanned-looking JPG.
+import os
+import random
+import textwrap
+
+from docx import Document
+import fitz
+from PIL import Image, ImageDraw, ImageFont
+
+from services.candidate_service import TECH_KEYWORDS
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+# target words per resume
+SIZES = {"small": 300, "medium": 1200, "large": 6000}
+
+_FIRST = ["Asha", "Ravi", "Maria", "John", "Wei", "Fatima", "Lucas", "Priya", "Omar", "Elena"]
+_LAST = ["Sharma", "Garcia", "Smith", "Chen", "Khan", "Silva", "Patel", "Novak", "Okafor", "Kim"]
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+_TITLES = ["Software Engineer", "Backend Developer", "Data Scientist", "DevOps Engineer",
+           "Full Stack Developer", "ML Engineer", "Frontend Developer"]
+_DEGREES = ["B.Tech in Computer Science", "Bachelor of Science", "M.Sc Computer Science", "MBA",
+            "PhD in Machine Learning", "Diploma in IT"]
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_FILLER = ("designed built maintained scalable services improved latency reduced costs mentored team "
+           "collaborated stakeholders delivered features production monitoring automated pipelines "
+           "migrated legacy systems reviewed code wrote documentation owned roadmap").split()
+
+
+def _sentence(rng: random.Random, skills):
+    words = rng.sample(_FILLER, 8) + rng.sample(skills, min(2, len(skills)))
+    rng.shuffle(words)
+    return " ".join(words).capitalize() + "."
+
+
+def generate_resume(rng: random.Random, size: str = "medium") -> str:
+    """A plausible resume: summary, dated experience, education and skills sections."""
+    target = SIZES[size]
+    skills = rng.sample(TECH_KEYWORDS, rng.randint(6, 20))
+    lines = [f"{rng.choice(_FIRST)} {rng.choice(_LAST)}", "Summary",
+             f"{rng.choice(_TITLES)} with {rng.randint(1, 15)} years of experience. " + _sentence(rng, skills),
+             "", "Work Experience"]
+
+    year = 2025
+    words = sum(len(line.split()) for line in lines)
+    while words < target:
+        start = year - rng.randint(1, 4)
+        end = "Present" if year == 2025 else f"{rng.choice(_MONTHS)} {year}"
+        header = f"{rng.choice(_TITLES)}, {rng.choice(_COMPANIES)}, {rng.choice(_MONTHS)} {start} - {end}"
+        body = [_sentence(rng, skills) for _ in range(rng.randint(3, 8))]
+        lines += [header] + body + [""]
+        words += sum(len(line.split()) for line in body) + len(header.split())
+        year = start if start > 1980 else 2025
+
+    lines += ["Education", f"{rng.choice(_DEGREES)}, {rng.randint(2000, 2020)}", "",
+              "Skills", ", ".join(skills)]
+    return "\n".join(lines)
+
+
+def generate_job(rng: random.Random):
+    """(title, description, scoringKeywords)"""
+    keywords = rng.sample(TECH_KEYWORDS, rng.randint(4, 10))
+    title = rng.choice(_TITLES)
+    description = (f"We are hiring a {title} with {rng.randint(2, 8)}+ years of experience in "
+                   f"{', '.join(keywords)}. " + " ".join(_sentence(rng, keywords) for _ in range(5)))
+    return title, description, keywords
+
+
+# ---------- writers ----------
+def write_txt(text: str, path: str) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def write_pdf(text: str, path: str, lines_per_page: int = 55) -> str:
+    # wrap ourselves so long lines don't run off the page edge
+    lines = [wrapped for line in text.splitlines() for wrapped in (textwrap.wrap(line, 100) or [""])]
+    doc = fitz.open()
+    for i in range(0, max(len(lines), 1), lines_per_page):
+        page = doc.new_page()
+        for j, line in enumerate(lines[i:i + lines_per_page]):
+            page.insert_text((50, 60 + 13 * j), line, fontsize=9)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def write_docx(text: str, path: str) -> str:
+    # reuse the sample's styles so the file looks like a real upload
+    template = os.path.join(ASSETS_DIR, "sample.docx")
+    doc = Document(template) if os.path.exists(template) else Document()
+    body = doc.element.body
+    for element in list(body):
+        if not element.tag.endswith("sectPr"):
+            body.remove(element)
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    doc.save(path)
+    return path
+
+
+def write_jpg(text: str, path: str, max_lines: int = 80) -> str:
+    lines = text.splitlines()[:max_lines]
+    image = Image.new("L", (1700, 40 + 28 * len(lines)), color=255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    for i, line in enumerate(lines):
+        draw.text((60, 20 + 28 * i), line[:150], fill=0, font=font)
+    image.save(path, quality=90, dpi=(200, 200))
+    return path
+
+
+WRITERS = {"txt": write_txt, "pdf": write_pdf, "docx": write_docx, "jpg": write_jpg}
+
+
+def generate_corpus(out_dir: str, count: int, sizes=("small", "medium", "large"),
+                    formats=("txt", "pdf", "docx"), seed: int = 42):
+    """
+    Write `count` resumes per size and format into out_dir.
+    Returns [(path, fmt, size, text)].
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    files = []
+    for size in sizes:
+        for i in range(count):
+            text = generate_resume(rng, size)
+            for fmt in formats:
+                path = WRITERS[fmt](text, os.path.join(out_dir, f"{size}_{i}.{fmt}"))
+                files.append((path, fmt, size, text))
+    return files
@@ -1,8 +1,124 @@
-from dotenv import load_dotenv
 import os
+from typing import Optional
 
-# Load .env file
-load_dotenv()
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Read database URL
-DATABASE_URL = os.getenv("DATABASE_URL")
+
+def _cpus() -> int:
+    return os.cpu_count() or 2
+
+
+class Settings(BaseSettings):
+    """
+    All runtime configuration, read from the environment / .env file.
+    Field names match the environment variable names.
+    """
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # Read database URL
+    DATABASE_URL: Optional[str] = None
+
+    # SQLAlchemy engine / connection pool (see database.py)
+    # pool_size + max_overflow should cover THREADPOOL_SIZE: sync routes hold a
+    # connection per thread, and session cleanup itself needs a free thread
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # Postgres only; 0 disables
+
+    # Starlette/anyio worker threads for sync routes and dependencies
+    THREADPOOL_SIZE: int = 40
+
+    # Request latency / stage timing histograms served on GET /metrics (see utils/metrics.py)
+    METRICS_ENABLED: bool = True
+    LOG_LEVEL: str = "INFO"
+
+    # Per-route SQL statement counts (see utils/query_counter.py, GET /system/query-counts);
+    # off by default: it wraps every request and exposes route internals
+    QUERY_COUNT_ENABLED: bool = False
+
+    # Async stack (AsyncSession + asyncpg / aiosqlite); see database.py and routes/async_api.py
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None  # derived from DATABASE_URL when unset
+
+    # TF-IDF index refresh policy (see services/tfidf_index.py)
+    TFIDF_REFIT_INTERVAL_SECONDS: int = 3600
+    TFIDF_REFIT_AFTER_DOCS: int = 50
+
+    # LSA semantic similarity, refitted with the TF-IDF index (see services/semantic_index.py)
+    SEMANTIC_ENABLED: bool = True
+    SEMANTIC_DIMENSIONS: int = 128
+
+    # Postgres text search configuration for resume search (SQLite uses FTS5 with porter stemming)
+    SEARCH_LANGUAGE: str = "english"
+
+    # Background resume parsing/scoring (see services/resume_worker.py)
+    RESUME_WORKER_CONCURRENCY: int = Field(default_factory=_cpus)
+    RESUME_WORKER_POLL_SECONDS: float = 2
+    # a claimed task whose lease isn't renewed for this long (its worker died) is re-queued
+    RESUME_TASK_LEASE_SECONDS: float = 120
+
+    # Bulk candidate import (see candidate_service.import_candidates)
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000  # per-row errors returned; the rest are only counted
+
+    # Multipart resume uploads (see routes/candidates.py)
+    RESUME_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    RESUME_STORE_DIR: str = "uploads/blobs"
+
+    # PDF extraction (see utils/text_extraction.py)
+    PDF_PARALLEL_PAGE_THRESHOLD: int = 16
+    PDF_EXTRACT_WORKERS: int = Field(default_factory=lambda: min(4, os.cpu_count() or 1))
+    PDF_OCR_DPI: int = 300
+
+    # OCR for image resumes and scanned PDF pages (see utils/ocr.py)
+    OCR_TARGET_DPI: int = 300
+    OCR_MAX_DIMENSION: int = 2500
+    OCR_DESKEW_MAX_ANGLE: float = 5
+    OCR_MAX_PROCESSES: int = Field(default_factory=_cpus)
+    OCR_CACHE_DIR: str = "uploads/ocr_cache"
+
+    # Scoring weights cache; a new config written through the API applies at once
+    # in the process that wrote it (see services/scoring_service.py)
+    SCORING_CONFIG_TTL_SECONDS: float = 300
+
+    # Per-job top-K ranking cache; the TTL bounds staleness from score writes in other processes (see services/scoring_service.py)
+    TOPK_CACHE_ENABLED: bool = True
+    TOPK_CACHE_SIZE: int = 200
+    TOPK_CACHE_TTL_SECONDS: float = 30
+
+    # Per-job skill bitmap index; bounds staleness from writes in other processes (see services/skill_index.py)
+    SKILL_INDEX_TTL_SECONDS: float = 60
+
+    # Talent-pool suggestions computed when a job is created; 0 disables (see services/talent_pool.py)
+    TALENT_POOL_SUGGESTIONS: int = 50
+    TALENT_POOL_CHUNK_SIZE: int = 5000  # parsed resumes scored per batch
+
+    # Near-duplicate resume detection (see services/duplicate_index.py)
+    DUPLICATE_JACCARD_THRESHOLD: float = 0.8
+    MINHASH_PERMUTATIONS: int = 128
+    MINHASH_SHINGLE_SIZE: int = 3  # words per shingle
+    DUPLICATE_INDEX_TTL_SECONDS: float = 300
+
+    # Authenticated principal cache (see services/auth_services.py)
+    AUTH_CACHE_TTL_SECONDS: float = 60
+    AUTH_CACHE_SIZE: int = 10000
+
+    # Password hashing (see services/auth_services.py)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = Field(default_factory=_cpus)
+    PASSWORD_HASH_CONCURRENCY: int = Field(default_factory=_cpus)
+
+
+settings = Settings()
+
+# kept for existing imports
+DATABASE_URL = settings.DATABASE_URL
@@ -1,16 +1,75 @@
 # database.py
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
+from sqlalchemy.pool import QueuePool
+
+from config import settings
+
+
+DATABASE_URL = settings.DATABASE_URL
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
 
+    def recreate(self):
+        # keep counters across pool recreation (e.g. after engine.dispose())
+        new_pool = super().recreate()
+        new_pool.wait_count, new_pool.wait_total = self.wait_count, self.wait_total
+        new_pool.wait_max, new_pool.timeouts = self.wait_max, self.timeouts
+        return new_pool
 
-load_dotenv()
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.wait_count += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+def _engine_kwargs(url: str):
+    kwargs = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") == "sqlite:"):
+        # in-memory sqlite keeps its single-connection pool
+        return kwargs
+
+    kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.startswith("postgresql") and settings.DB_STATEMENT_TIMEOUT_MS:
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
+
+
+engine = create_engine(DATABASE_URL, **_engine_kwargs(DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -22,3 +81,102 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def ensure_columns(engine, metadata=None) -> list:
+    """
+    Add model columns and indexes missing from tables that already exist.
+
+    create_all only creates missing tables, so columns added to an existing
+    model (all nullable) would otherwise break every query on a database
+    created before them. Run at startup after create_all; returns what was added.
+    """
+    metadata = metadata if metadata is not None else Base.metadata
+    quote = engine.dialect.identifier_preparer.quote
+    # several workers may start at once; postgres can skip a column another one just added
+    if_not_exists = " IF NOT EXISTS" if engine.dialect.name == "postgresql" else ""
+    added = []
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                conn.execute(text(f"ALTER TABLE {quote(table.name)} ADD COLUMN{if_not_exists} {quote(column.name)} "
+                                  f"{column.type.compile(dialect=engine.dialect)}"))
+                added.append(f"{table.name}.{column.name}")
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn, checkfirst=True)
+                    added.append(index.name)
+    return added
+
+
+# ---------- async stack (ASYNC_DB_ENABLED) ----------
+_async_engine = None
+AsyncSessionLocal = None
+
+
+def async_database_url(url: str) -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    scheme, _, rest = url.partition("://")
+    driver = {"postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg",
+              "postgresql+psycopg2": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}.get(scheme, scheme)
+    return f"{driver}://{rest}"
+
+
+def get_async_engine():
+    # created lazily so the sync-only setup doesn't need asyncpg / aiosqlite installed
+    global _async_engine, AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = async_database_url(DATABASE_URL)
+        kwargs = _engine_kwargs(url)
+        kwargs.pop("poolclass", None)  # async engines need AsyncAdaptedQueuePool
+        if url.startswith("postgresql") and settings.DB_STATEMENT_TIMEOUT_MS:
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        _async_engine = create_async_engine(url, **kwargs)
+        AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+def pool_stats():
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.wait_count,
+            wait_seconds_total=round(pool.wait_total, 6),
+            wait_seconds_avg=round(pool.wait_total / pool.wait_count, 6) if pool.wait_count else 0.0,
+            wait_seconds_max=round(pool.wait_max, 6),
+            timeouts=pool.timeouts,
+        )
+    return stats
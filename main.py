@@ -1,8 +1,25 @@
+import logging
+
+import anyio
 from fastapi import FastAPI
+from config import settings
 from routes import router
 from fastapi.middleware.cors import CORSMiddleware
-from database import Base, engine
+from database import Base, SessionLocal, dispose_async_engine, engine, ensure_columns
+from services.resume_worker import resume_worker
+from services.search_index import resume_search_index
+from services.skill_index import skill_index
+from services.duplicate_index import duplicate_index
+from services.auth_services import shutdown_hash_pool
+from utils.text_extraction import shutdown_page_pool
 from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from utils.body_limit import BodySizeLimitMiddleware
+from utils.metrics import MetricsMiddleware
+from utils.query_counter import QueryCountMiddleware
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
 
 
 app = FastAPI(title="AI Recruitment API")
@@ -16,6 +33,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# reject oversized uploads before the multipart body is parsed and spooled to disk
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    # room for the multipart boundaries and part headers around the file
+    limits=[(r"/candidates/[^/]+/upload-resume-file", settings.RESUME_MAX_UPLOAD_BYTES + 64 * 1024)],
+    detail="Resume file too large",
+)
+
+if settings.QUERY_COUNT_ENABLED:
+    app.add_middleware(QueryCountMiddleware)
+
+# outermost, so its latency covers the other middleware too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 @app.get("/")
 def root():
     return {"message": "Recruitment AI module running 🚀"}
@@ -23,20 +55,41 @@ def root():
 
 @app.on_event("startup")
 def startup_event():
+    # sync routes run here; keep it in line with the DB pool size
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
     try:
         with engine.connect() as conn:
             conn.execute(text("SELECT 1")) 
-        print("✅ Database connected successfully")
+        logger.info("✅ Database connected successfully")
         Base.metadata.create_all(bind=engine)
+        added = ensure_columns(engine)
+        if added:
+            logger.info("🛠️ Added missing columns and indexes: %s", ", ".join(added))
+        resume_search_index.ensure_schema(engine)
+        resume_worker.start()
+        logger.info("⚙️ Resume worker started (%d processes)", resume_worker.concurrency)
 
     except Exception as e:
-        print("❌ Database connection failed:", e)
+        logger.error("❌ Database connection failed: %s", e)
+        return
+
+    # indexes rebuilt from existing rows; a failure here leaves them to fill lazily, not the app down
+    for name, backfill in (("skill index", skill_index.backfill), ("duplicate index", duplicate_index.backfill)):
+        try:
+            with SessionLocal() as db:
+                backfill(db)
+        except Exception:
+            logger.exception("❌ %s backfill failed", name.capitalize())
 
 
 @app.on_event("shutdown")
-def shutdown_event():
+async def shutdown_event():
+    await run_in_threadpool(resume_worker.stop)
+    shutdown_hash_pool()
+    shutdown_page_pool()
+    await dispose_async_engine()
     engine.dispose()
-    print("🛑 Database connection pool closed")
+    logger.info("🛑 Database connection pool closed")
 
 # ✅ Include all routes
 app.include_router(router)
@@ -1,26 +1,24 @@
 import os
-from PIL import Image
-import pytesseract
-import fitz
 from docx import Document
-import io
 
-def extract_text(file_path):
+from utils.ocr import merge_timings, ocr_image
+from utils.text_extraction import extract_pdf_text
+
+def extract_text(file_path, ocr_timings=None):
+    """Text of a resume file; OCR stage timings are added to `ocr_timings` if given."""
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext == '.pdf':
-        text = ""
-        pdf = fitz.open(file_path)
-        for page in pdf:
-            text += page.get_text("text")
-        return text
+        return extract_pdf_text(file_path, ocr_timings=ocr_timings)
 
     elif ext == '.docx':
         doc = Document(file_path)
         return "\n".join([p.text for p in doc.paragraphs])
 
     elif ext in ['.png', '.jpg', '.jpeg']:
-        return pytesseract.image_to_string(Image.open(file_path))
+        result = ocr_image(file_path)
+        merge_timings(ocr_timings, result.timings)
+        return result.text
 
     else:
         return "Unsupported file format."
@@ -1,6 +1,7 @@
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text, func,Enum
+    Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text, func,Enum, Index, LargeBinary
 )
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from database import Base
 import enum
@@ -50,7 +51,18 @@ class Candidate(Base):
     score = Column(Float, nullable=True)
     scoreBreakdown = Column(JSON, nullable=True)
     status = Column(String, default="applied")  # applied, screened, interviewed, offered, rejected, hired
-    createdAt = Column(DateTime(timezone=True), server_default=func.now())
+    # sqlite stores CURRENT_TIMESTAMP without microseconds; bind cursor values the same way
+    createdAt = Column(
+        DateTime(timezone=True).with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        # keyset pagination / ranking per job (see candidate_service.list_candidates)
+        Index("ix_candidates_job_created", "jobId", "createdAt", "id"),
+        Index("ix_candidates_job_score", "jobId", "score"),
+        Index("ix_candidates_created", "createdAt", "id"),
+    )
 
 
 # ================= RESUME FILE MODEL ===================
@@ -63,6 +75,7 @@ class ResumeFile(Base):
     path = Column(String, nullable=False)
     mimetype = Column(String)
     size = Column(Integer)
+    sha256 = Column(String(64), index=True, nullable=True)
     uploadedAt = Column(DateTime, default=func.now())
     candidate = relationship("Candidate", back_populates="resume")
 
@@ -75,8 +88,87 @@ class ResumeParsed(Base):
     candidateId = Column(Integer, ForeignKey("candidates.id"))
     text = Column(Text, nullable=False)
     keywords = Column(JSON, nullable=True)
+    # precomputed at parse time (utils/resume_features.py); scoring reads these, not `text`
+    termCounts = Column(JSON, nullable=True)
+    experienceYears = Column(Float, nullable=True)
+    educationLevel = Column(String, nullable=True)
+    featuresVersion = Column(Integer, nullable=True)
+    minhash = Column(LargeBinary, nullable=True)  # uint32 MinHash signature (services/duplicate_index.py)
     candidate = relationship("Candidate", back_populates="parsedResume")
 
+    __table_args__ = (
+        # latest parse per candidate (max(id) ... WHERE candidateId = ?)
+        Index("ix_resume_parsed_candidate", "candidateId", "id"),
+    )
+
+
+# ================= SKILL MODELS ===================
+class Skill(Base):
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)  # lower-cased keyword
+
+
+class CandidateSkill(Base):
+    """Skills found in a candidate's latest parsed resume (see services/skill_index.py)."""
+    __tablename__ = "candidate_skills"
+
+    candidateId = Column(Integer, ForeignKey("candidates.id"), primary_key=True)
+    skillId = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_candidate_skills_skill", "skillId", "candidateId"),
+    )
+
+
+# ================= TALENT POOL SUGGESTION MODEL ===================
+class TalentSuggestion(Base):
+    """Past applicants matched to a job when it was created (see services/talent_pool.py)."""
+    __tablename__ = "talent_suggestions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jobId = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    candidateId = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    score = Column(Float, nullable=False)
+    scoreBreakdown = Column(JSON, nullable=True)
+    createdAt = Column(DateTime, default=func.now())
+    candidate = relationship("Candidate")
+
+    __table_args__ = (
+        Index("ix_talent_suggestions_job_score", "jobId", "score"),
+    )
+
+
+# ================= DUPLICATE RESUME MODEL ===================
+class ResumeDuplicate(Base):
+    """A parsed resume found to be a near-duplicate of an earlier candidate's."""
+    __tablename__ = "resume_duplicates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    candidateId = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    duplicateOfId = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    similarity = Column(Float, nullable=False)  # estimated Jaccard over word shingles
+    createdAt = Column(DateTime, default=func.now())
+    candidate = relationship("Candidate", foreign_keys=[candidateId])
+    duplicateOf = relationship("Candidate", foreign_keys=[duplicateOfId])
+
+    __table_args__ = (
+        Index("ix_resume_duplicates_candidate", "candidateId"),
+        Index("ix_resume_duplicates_similarity", "similarity"),
+    )
+
+
+# ================= EXTRACTION CACHE MODEL ===================
+class ResumeExtraction(Base):
+    __tablename__ = "resume_extractions"
+
+    sha256 = Column(String(64), primary_key=True)
+    text = Column(Text, nullable=False)
+    keywords = Column(JSON, nullable=True)
+    features = Column(JSON, nullable=True)
+    createdAt = Column(DateTime, default=func.now())
+
 
 # ================= INTERVIEW MODEL ===================
 class Interview(Base):
@@ -112,3 +204,20 @@ class ScoringConfig(Base):
     name = Column(String, nullable=False)
     config = Column(JSON, nullable=True)
     updatedAt = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+# ================= RESUME PROCESSING TASK MODEL ===================
+class ResumeTask(Base):
+    __tablename__ = "resume_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    candidateId = Column(Integer, ForeignKey("candidates.id"), nullable=False)
+    resumeId = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    status = Column(String, default="queued", index=True)  # queued, processing, done, failed
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    # worker process holding a `processing` task, and until when (renewed while it runs)
+    claimedBy = Column(String, nullable=True)
+    leaseUntil = Column(DateTime, nullable=True)
+    createdAt = Column(DateTime, default=func.now())
+    updatedAt = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -1,10 +1,21 @@
 from fastapi import APIRouter
+from config import settings
 from .hr import router as admin_router
 from .candidates import router as candidate_router
 from .auth_router import router as auth_router1
+from .system import router as system_router, metrics_router
 
 router = APIRouter()
 
+if settings.ASYNC_DB_ENABLED:
+    # async CRUD endpoints take precedence over their sync twins below; their id
+    # paths are int-typed so fixed sync paths (/candidates/search, ...) still match
+    from .async_api import candidate_router as async_candidate_router, job_router as async_job_router
+    router.include_router(async_candidate_router)
+    router.include_router(async_job_router)
+
 router.include_router(auth_router1)
 router.include_router(admin_router)
 router.include_router(candidate_router)
+router.include_router(system_router)
+router.include_router(metrics_router)
@@ -0,0 +1,63 @@
+# routes/async_api.py
+# Async (AsyncSession) versions of the candidate and job CRUD endpoints.
+# Mounted ahead of the sync routers when ASYNC_DB_ENABLED is set. Handlers,
+# the session and the auth dependencies are all async, so these paths don't
+# go through Starlette's threadpool (talent-pool matching after create-job
+# still runs there as a background task).
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import schemas
+from database import get_async_db
+from model import models
+from services import async_candidate_service as CandidateService
+from services import async_job_service as JobService
+from services.auth_services import require_candidate_async, require_hr_async
+
+candidate_router = APIRouter(prefix="/candidates", tags=["Candidates"])
+job_router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@candidate_router.post("/apply", response_model=schemas.CandidateResponse)
+async def apply_for_job(candidate: schemas.CandidateCreate, db: AsyncSession = Depends(get_async_db),current_user: models.User = Depends(require_candidate_async)):
+    return await CandidateService.apply_for_job(candidate, db)
+
+
+@candidate_router.get("/list",response_model=schemas.CandidatePage)
+async def list_candidates(jobId: int | None = None, limit: int = Query(50, ge=1, le=500), cursor: str | None = None,
+                          status: str | None = None, minScore: float | None = None, maxScore: float | None = None,
+                          db: AsyncSession = Depends(get_async_db)):
+
+    return await CandidateService.list_candidates(db, job_id=jobId, limit=limit, cursor=cursor, status=status,
+                                                  min_score=minScore, max_score=maxScore)
+
+
+@candidate_router.get("/{candidate_id:int}",response_model=schemas.CandidateResponse)
+async def get_candidate(candidate_id: int, db: AsyncSession = Depends(get_async_db),current_user: models.User = Depends(require_hr_async)):
+    return await CandidateService.get_candidate(candidate_id, db)
+
+
+@candidate_router.patch("/{candidate_id:int}", response_model=schemas.CandidateResponse)
+async def update_candidate(candidate_id: int, update_data: dict, db: AsyncSession = Depends(get_async_db)):
+
+    return await CandidateService.update_candidate(candidate_id, update_data, db)
+
+
+@job_router.post("/create-job", response_model=schemas.JobResponse)
+async def create_job(job: schemas.JobCreate, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_async_db),current_user: models.User = Depends(require_hr_async)):
+    return await JobService.create_job(job, db, background_tasks)
+
+
+@job_router.get("/get-jobs", response_model=list[schemas.JobResponse])
+async def list_jobs(db: AsyncSession = Depends(get_async_db)):
+    return await JobService.list_jobs(db)
+
+
+@job_router.post("/schedule", response_model=schemas.InterviewResponse)
+async def schedule_interview(data: schemas.InterviewCreate, db: AsyncSession = Depends(get_async_db),current_user: models.User = Depends(require_hr_async)):
+    return await JobService.schedule_interview(data, db)
+
+
+@job_router.post("/give", response_model=schemas.FeedbackResponse)
+async def give_feedback(data: schemas.FeedbackCreate, db: AsyncSession = Depends(get_async_db),current_user: models.User = Depends(require_hr_async)):
+    return await JobService.add_feedback(data, db)
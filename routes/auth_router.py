@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from database import get_db
 # from model import User
 from model.models import User
 
 from schemas import UserCreate, UserLogin
-from services.auth_services import create_access_token, hash_password, verify_password
+from services.auth_services import create_user_token, hash_password_async, verify_and_update_password_async
 # from auth.auth_service import (
 #     get_db, hash_password, verify_password, create_access_token
 # )
@@ -13,8 +14,8 @@ from services.auth_services import create_access_token, hash_password, verify_pa
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/register")
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(lambda: db.query(User).filter(User.email == user.email).first())
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
@@ -23,21 +24,31 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     new_user = User(
         username=user.username,
         email=user.email,
-        password=hash_password(user.password),
+        password=await hash_password_async(user.password),
         role=role_value
     )   
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(db.commit)
+    await run_in_threadpool(db.refresh, new_user)
     return {"msg": "User registered successfully", "user": new_user.email}
 
 
 @router.post("/login")
-def login_user(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if not db_user or not verify_password(user.password, db_user.password):
+async def login_user(user: UserLogin, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(lambda: db.query(User).filter(User.email == user.email).first())
+    if not db_user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    token = create_access_token({"sub": db_user.email})
-    return {"access_token": token, "token_type": "bearer", "role": db_user.role}
+    valid, new_hash = await verify_and_update_password_async(user.password, db_user.password)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    # read before the commit below expires db_user, which would lazy-load on the event loop
+    token = create_user_token(db_user)
+    role = db_user.role
+    if new_hash:
+        # Argon2 parameters changed since this hash was made; upgrade it transparently
+        db_user.password = new_hash
+        await run_in_threadpool(db.commit)
 
+    return {"access_token": token, "token_type": "bearer", "role": role}
@@ -1,15 +1,25 @@
 # routes/candidates.py
 import base64
+import hashlib
 from datetime import datetime
 import os
 import re
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from config import settings
 from database import get_db
 from model import models
 from services import candidate_service as CandidateService
+from services import resume_worker as ResumeWorker
+from services import scoring_service as ScoringService
+from services import duplicate_index as DuplicateIndex
+from services.search_index import resume_search_index
 from sqlalchemy.orm import Session
 import schemas
-from services.auth_services import require_candidate, require_hr
+from services.auth_services import get_current_user, require_candidate, require_hr
+from utils.blob_store import blob_store
+from utils.bulk_import import FORMATS, detect_format, iter_rows
+from utils.file_types import SNIFF_BYTES, is_docx, sniff_file_type
+from utils.metrics import span
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 
 
@@ -22,10 +32,56 @@ def apply_for_job(candidate: schemas.CandidateCreate, db: Session = Depends(get_
     return CandidateService.apply_for_job(candidate, db)
 
 
-@router.get("/list",response_model=list[schemas.CandidateResponse])
-def list_candidates(jobId: int | None = None, db: Session = Depends(get_db)):
-    
-    return CandidateService.list_candidates(db, job_id=jobId)
+@router.get("/list",response_model=schemas.CandidatePage)
+def list_candidates(jobId: int | None = None, limit: int = Query(50, ge=1, le=500), cursor: str | None = None,
+                    status: str | None = None, minScore: float | None = None, maxScore: float | None = None,
+                    db: Session = Depends(get_db)):
+
+    return CandidateService.list_candidates(db, job_id=jobId, limit=limit, cursor=cursor, status=status,
+                                            min_score=minScore, max_score=maxScore)
+
+
+@router.post("/import", response_model=schemas.CandidateImportResult)
+def import_candidates(file: UploadFile = File(...), jobId: int | None = None, format: str | None = None,
+                      batchSize: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=10000),
+                      db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    """
+    Bulk import from a CSV (header row: firstName,lastName,email,phone,jobId) or
+    NDJSON file. `jobId` applies to rows that don't carry their own.
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail="Unknown import format; pass format=csv or format=ndjson")
+    return CandidateService.import_candidates(iter_rows(file.file, fmt), db, default_job_id=jobId,
+                                              batch_size=batchSize)
+
+
+@router.get("/search", response_model=schemas.CandidateSearchPage)
+def search_candidates(q: str = Query(..., min_length=1, max_length=500), jobId: int | None = None,
+                      limit: int = Query(20, ge=1, le=100), offset: int = Query(0, ge=0, le=10000),
+                      db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    """
+    Full-text search over candidates' latest parsed resumes, best match first.
+    Supports "quoted phrases", OR and -excluded terms; snippets mark matches with <mark>.
+    """
+    return resume_search_index.search(db, q, limit=limit, offset=offset, job_id=jobId)
+
+
+@router.get("/duplicates", response_model=list[schemas.ResumeDuplicateResponse])
+def duplicate_candidates(minSimilarity: float = Query(settings.DUPLICATE_JACCARD_THRESHOLD, ge=0, le=1),
+                         jobId: int | None = None, limit: int = Query(100, ge=1, le=1000), offset: int = Query(0, ge=0),
+                         db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    """
+    Candidates whose resume is a near-duplicate (MinHash-estimated Jaccard) of an
+    earlier candidate's, detected at parse time. Most similar first.
+    """
+    return DuplicateIndex.duplicates_report(db, min_similarity=minSimilarity, job_id=jobId,
+                                            limit=limit, offset=offset)
+
+
+@router.get("/resume-tasks/{task_id}", response_model=schemas.ResumeTaskResponse)
+def get_resume_task(task_id: int, db: Session = Depends(get_db),current_user: models.User = Depends(get_current_user)):
+    return ResumeWorker.get_task(task_id, db, current_user)
 
 
 @router.get("/{candidate_id}",response_model=schemas.CandidateResponse)
@@ -33,6 +89,11 @@ def get_candidate(candidate_id: int, db: Session = Depends(get_db),current_user:
     return CandidateService.get_candidate(candidate_id, db)
 
 
+@router.get("/{candidate_id}/job-matches", response_model=list[schemas.JobMatch])
+def job_matches(candidate_id: int, k: int = Query(10, ge=1, le=100), db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    return ScoringService.job_matches(candidate_id, k, db)
+
+
 @router.patch("/{candidate_id}", response_model=schemas.CandidateResponse)
 def update_candidate(candidate_id: int, update_data: dict, db: Session = Depends(get_db)):
   
@@ -61,17 +122,14 @@ def upload_resume(candidate_id: int, payload: dict, db: Session = Depends(get_db
             raise HTTPException(status_code=400, detail="Unsupported file format")
 
         # decode base64 data
-        file_data = re.sub('^data:.*;base64,', '', image_data)
-        binary = base64.b64decode(file_data)
+        with span("upload_resume", "decode"):
+            file_data = re.sub('^data:.*;base64,', '', image_data)
+            binary = base64.b64decode(file_data)
 
-        # save file
-        upload_dir = "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
+        # save file (content-addressed, identical uploads share one blob)
+        with span("upload_resume", "file_write"):
+            sha256, file_path = blob_store.put_bytes(binary, ext)
         filename = f"{candidate_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}"
-        file_path = os.path.join(upload_dir, filename)
-
-        with open(file_path, "wb") as f:
-            f.write(binary)
 
         # store metadata
         db_file = models.ResumeFile(
@@ -80,25 +138,27 @@ def upload_resume(candidate_id: int, payload: dict, db: Session = Depends(get_db
             path=file_path,
             mimetype=f"application/{ext}",
             size=len(binary),
+            sha256=sha256,
         )
         db.add(db_file)
-        db.commit()
-        db.refresh(db_file)
-
-        parsed_data = CandidateService.parse_resume(candidate_id, db)
+        with span("upload_resume", "db_commit"):
+            db.commit()
+            db.refresh(db_file)
 
-        score_data = CandidateService.calculate_resume_score(candidate_id, db)
+        # parsing + scoring happen in the background worker (stages under "resume_task")
+        with span("upload_resume", "enqueue"):
+            task = ResumeWorker.enqueue_resume(candidate_id, db_file.id, db)
 
         return {
             "success": True,
-            "message": "Resume uploaded successfully",
+            "message": "Resume uploaded successfully, processing started",
             "data": {
                 "candidate_id": candidate_id,
                 # "filename": File.filename,
                 # "mimetype": File.content_type,
                 "path": file_path,
-                "keywords":parsed_data.get("keywords"),
-                "score": score_data.get("score")
+                "task_id": task.id,
+                "status": task.status
             }
         }
 
@@ -109,55 +169,86 @@ def upload_resume(candidate_id: int, payload: dict, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=str(e))
     
 
-# @router.post("/{candidate_id}/upload-resume")
-# def upload_resume(candidate_id: int, file: UploadFile = File(...), db: Session = Depends(get_db),current_user: models.User = Depends(require_candidate)):
-#     try:
-#         # Check file type
-#         allowed_ext = ["pdf", "doc", "docx", "png", "jpg", "jpeg"]
-#         ext = file.filename.split(".")[-1].lower()
-#         if ext not in allowed_ext:
-#             raise HTTPException(status_code=400, detail="Invalid file format. Only PDF, DOC, DOCX, PNG, JPG allowed.")
-
-#         # Save file locally
-#         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-#         file_path = os.path.join(UPLOAD_DIR, f"{candidate_id}_{timestamp}_{file.filename}")
-#         with open(file_path, "wb") as f:
-#             f.write(file.file.read())
-
-#         # Save file metadata in DB
-#         file_meta = models.ResumeFile(
-#             candidateId=candidate_id,
-#             filename=file.filename,
-#             path=file_path,
-#             mimetype=file.content_type,
-#             size=os.path.getsize(file_path),
-#         )
-
-#         db.add(file_meta)
-#         db.commit()
-#         db.refresh(file_meta)
-
-#         parsed_data = CandidateService.parse_resume(candidate_id, db)
-
-#         score_data = CandidateService.calculate_resume_score(candidate_id, db)
-
-#         return {
-#             "success": True,
-#             "message": "Resume uploaded successfully",
-#             "data": {
-#                 "candidate_id": candidate_id,
-#                 "filename": file.filename,
-#                 "mimetype": file.content_type,
-#                 "path": file_path,
-#                 "keywords":parsed_data.get("keywords"),
-#                 "score": score_data.get("score")
-#             }
-#         }
-
-#     except HTTPException:
-#         raise
-#     except Exception as e:
-#         db.rollback()
-#         raise HTTPException(status_code=500, detail=str(e))
+def _stream_to_disk(file: UploadFile):
+    """
+    Copy the upload into the blob store in fixed-size chunks, hashing as we go,
+    sniffing the type from the first chunk and aborting as soon as the size
+    limit is exceeded. Returns (path, sha256, ext, mimetype, size).
+    """
+    head = file.file.read(settings.UPLOAD_CHUNK_SIZE)
+    detected = sniff_file_type(head[:SNIFF_BYTES])
+    if not detected:
+        raise HTTPException(status_code=400, detail="Invalid file format. Only PDF, DOC, DOCX, PNG, JPG allowed.")
+    ext, mimetype = detected
+
+    digest = hashlib.sha256()
+    size = 0
+    tmp = blob_store.temp_file()
+    try:
+        with tmp:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > settings.RESUME_MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Resume file too large")
+                digest.update(chunk)
+                tmp.write(chunk)
+                chunk = file.file.read(settings.UPLOAD_CHUNK_SIZE)
+
+        if ext == "docx" and not is_docx(tmp.name):
+            raise HTTPException(status_code=400, detail="Invalid file format. Only PDF, DOC, DOCX, PNG, JPG allowed.")
+        sha256 = digest.hexdigest()
+        file_path = blob_store.commit(tmp.name, sha256, ext)
+    finally:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+
+    return file_path, sha256, ext, mimetype, size
+
+
+@router.post("/{candidate_id}/upload-resume-file")
+def upload_resume_file(candidate_id: int, file: UploadFile = File(...), db: Session = Depends(get_db),current_user: models.User = Depends(require_candidate)):
+    # oversized bodies are already rejected by BodySizeLimitMiddleware (main.py)
+    try:
+        CandidateService.get_candidate(candidate_id, db)
 
+        with span("upload_resume_file", "file_write"):
+            file_path, sha256, ext, mimetype, size = _stream_to_disk(file)
+
+        # Save file metadata in DB
+        file_meta = models.ResumeFile(
+            candidateId=candidate_id,
+            filename=file.filename or os.path.basename(file_path),
+            path=file_path,
+            mimetype=mimetype,
+            size=size,
+            sha256=sha256,
+        )
+        db.add(file_meta)
+        with span("upload_resume_file", "db_commit"):
+            db.commit()
+            db.refresh(file_meta)
+
+        # parsing + scoring happen in the background worker (stages under "resume_task")
+        with span("upload_resume_file", "enqueue"):
+            task = ResumeWorker.enqueue_resume(candidate_id, file_meta.id, db)
+
+        return {
+            "success": True,
+            "message": "Resume uploaded successfully, processing started",
+            "data": {
+                "candidate_id": candidate_id,
+                "filename": file_meta.filename,
+                "mimetype": mimetype,
+                "path": file_path,
+                "size": size,
+                "task_id": task.id,
+                "status": task.status
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,23 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from model import models
 import schemas
 from database import get_db
 from services import job_service as JobService
+from services import scoring_service as ScoringService
+from services import skill_index as SkillIndex
+from services import talent_pool as TalentPool
 from services.auth_services import require_candidate, require_hr
 
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 @router.post("/create-job", response_model=schemas.JobResponse)
-def create_job(job: schemas.JobCreate, db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
-    return JobService.create_job(job,db)
+def create_job(job: schemas.JobCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    return JobService.create_job(job, db, background_tasks)
 
 @router.get("/get-jobs", response_model=list[schemas.JobResponse])
 def list_jobs(db: Session = Depends(get_db)):
     return JobService.list_jobs(db)
 
 
+@router.post("/{job_id}/rescore")
+def rescore_job(job_id: int, db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    return ScoringService.rescore_job(job_id, db)
+
+
+@router.get("/scoring-config", response_model=schemas.ScoringConfigResponse)
+def get_scoring_config(db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    return ScoringService.get_scoring_config(db)
+
+
+@router.put("/scoring-config", response_model=schemas.ScoringConfigResponse)
+def update_scoring_config(data: schemas.ScoringConfigUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    config, changed = ScoringService.save_scoring_config(data.name, data.weights, db)
+    rescoring = changed and data.rescore
+    if rescoring:
+        # bulk re-score of every job with parsed resumes, after the response is sent
+        background_tasks.add_task(ScoringService.rescore_all_jobs)
+    return {**config, "changed": changed, "rescoring": rescoring}
+
+
+@router.get("/{job_id}/top", response_model=list[schemas.CandidateResponse])
+def top_candidates(job_id: int, k: int = Query(50, ge=1, le=1000), db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    return ScoringService.top_candidates(job_id, k, db)
+
+
 @router.post("/schedule", response_model=schemas.InterviewResponse)
 def schedule_interview(data: schemas.InterviewCreate, db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
     return JobService.schedule_interview(data, db)
@@ -43,4 +71,30 @@ def update_interview_status(interview_id: int, status: str, db: Session = Depend
 
 @router.post("/give", response_model=schemas.FeedbackResponse)
 def give_feedback(data: schemas.FeedbackCreate, db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
-    return JobService.add_feedback(data, db)
\ No newline at end of file
+    return JobService.add_feedback(data, db)
+
+
+@router.get("/{job_id}/skill-filter", response_model=schemas.SkillFilterPage)
+def skill_filter(job_id: int, all_of: list[str] = Query([], alias="all"), any_of: list[str] = Query([], alias="any"),
+                 none_of: list[str] = Query([], alias="none"),
+                 limit: int = Query(50, ge=1, le=1000), offset: int = Query(0, ge=0),
+                 db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    """
+    Candidates of a job by skill, e.g. ?all=python&all=kubernetes&none=php, answered
+    from the in-memory bitmap index. Ordered by matches against the job's scoring keywords.
+    """
+    return SkillIndex.filter_candidates(job_id, db, all_of=all_of, any_of=any_of, none_of=none_of,
+                                        limit=limit, offset=offset)
+
+
+@router.get("/{job_id}/suggestions", response_model=list[schemas.TalentSuggestionResponse])
+def talent_suggestions(job_id: int, limit: int = Query(50, ge=1, le=1000), db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    """
+    Past applicants (of other jobs) that best match this job, computed when it was created.
+    """
+    return TalentPool.get_suggestions(job_id, limit, db)
+
+
+@router.post("/{job_id}/suggestions/refresh")
+def refresh_talent_suggestions(job_id: int, db: Session = Depends(get_db),current_user: models.User = Depends(require_hr)):
+    return TalentPool.match_talent_pool(job_id, db)
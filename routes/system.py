@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from database import pool_stats
+from services.auth_services import require_hr
+from utils.metrics import registry
+from utils.query_counter import route_query_stats
+
+# pool and per-route query stats describe the deployment; HR only
+router = APIRouter(prefix="/system", tags=["System"], dependencies=[Depends(require_hr)])
+metrics_router = APIRouter(tags=["System"])
+
+
+@router.get("/db-pool")
+def db_pool():
+    """
+    Connection pool usage: checked-out / overflow connections and checkout wait times.
+    """
+    return pool_stats()
+
+
+@router.get("/query-counts")
+def query_counts():
+    """
+    SQL statements per request for every route served so far (requests, total, avg, max).
+    Empty unless QUERY_COUNT_ENABLED is set.
+    """
+    return route_query_stats.report()
+
+
+@router.post("/query-counts/reset")
+def reset_query_counts():
+    """Clear the per-route counts and return the report they held."""
+    report = route_query_stats.report()
+    route_query_stats.reset()
+    return report
+
+
+# ---------- Prometheus ----------
+def _db_pool_metrics():
+    stats = pool_stats()
+    gauges = [("checked_out", "Connections currently checked out."),
+              ("overflow", "Overflow connections currently open."),
+              ("size", "Configured pool size.")]
+    metrics = [(f"db_pool_{key}", "gauge", doc, [({}, stats[key])]) for key, doc in gauges if key in stats]
+    if "checkouts" in stats:
+        metrics += [
+            ("db_pool_checkouts_total", "counter", "Connection checkouts.", [({}, stats["checkouts"])]),
+            ("db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection.",
+             [({}, stats["wait_seconds_total"])]),
+            ("db_pool_timeouts_total", "counter", "Checkouts that timed out.", [({}, stats["timeouts"])]),
+        ]
+    return metrics
+
+
+def _query_count_metrics():
+    report = route_query_stats.report()
+    return [
+        ("http_request_sql_statements_total", "counter", "SQL statements issued by requests, per route.",
+         [(dict(zip(("method", "route"), key.split(" ", 1))), r["queries_total"]) for key, r in report.items()]),
+    ]
+
+
+registry.add_collector(_db_pool_metrics)
+registry.add_collector(_query_count_metrics)
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """
+    Prometheus text exposition: request latency per route, stage timings (OCR included), DB pool and query counts.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
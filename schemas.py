@@ -69,6 +69,59 @@ class CandidateResponse(BaseModel):
         # Pydantic v2: allow reading from SQLAlchemy objects
         from_attributes = True
 
+class CandidatePage(BaseModel):
+    items: List[CandidateResponse]
+    nextCursor: Optional[str] = None
+
+class CandidateSearchHit(BaseModel):
+    candidate: CandidateResponse
+    rank: float
+    snippet: Optional[str] = None
+
+class CandidateSearchPage(BaseModel):
+    items: List[CandidateSearchHit]
+    total: Optional[int] = None
+    nextOffset: Optional[int] = None
+
+class SkillFilterHit(BaseModel):
+    candidate: CandidateResponse
+    matchedCount: int  # of the job's scoring keywords
+
+class SkillFilterPage(BaseModel):
+    items: List[SkillFilterHit]
+    total: int
+    nextOffset: Optional[int] = None
+
+class TalentSuggestionResponse(BaseModel):
+    candidate: CandidateResponse
+    score: float
+    scoreBreakdown: Optional[Dict] = None
+    createdAt: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ResumeDuplicateResponse(BaseModel):
+    candidate: CandidateResponse
+    duplicateOf: CandidateResponse
+    similarity: float
+    createdAt: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ImportRowError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    errors: List[str]
+
+class CandidateImportResult(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    errorsTruncated: bool = False
+
 class CandidateUpdate(BaseModel):
     firstName: Optional[str] = None
     lastName: Optional[str] = None
@@ -91,11 +144,25 @@ class ResumeFileResponse(BaseModel):
     path: str
     mimetype: str
     size: int
+    sha256: Optional[str] = None
     uploadedAt: datetime
 
     class Config:
         from_attributes = True
 
+class ResumeTaskResponse(BaseModel):
+    id: int
+    candidateId: int
+    resumeId: int
+    status: str
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    createdAt: datetime
+    updatedAt: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class ParsedResumeBody(BaseModel):
     text: str
     keywords: Optional[List[str]] = []
@@ -104,6 +171,24 @@ class ScoreBody(BaseModel):
     score: float
     breakdown: Dict
 
+class ScoringConfigUpdate(BaseModel):
+    name: str = "default"
+    weights: Dict[str, float]
+    rescore: bool = True  # re-score existing candidates when the weights change
+
+class ScoringConfigResponse(BaseModel):
+    version: int
+    name: str
+    weights: Dict[str, float]
+    updatedAt: Optional[datetime] = None
+    changed: Optional[bool] = None
+    rescoring: Optional[bool] = None
+
+class JobMatch(BaseModel):
+    jobId: int
+    title: str
+    similarity: float
+
 
 
 class InterviewCreate(BaseModel):
@@ -0,0 +1,94 @@
+# services/async_candidate_service.py
+# AsyncSession versions of the candidate_service functions (ASYNC_DB_ENABLED).
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from model import models
+from services.candidate_service import (
+    apply_update, candidate_filters, candidate_page, decode_cursor, new_application, on_candidate_applied,
+    on_candidate_updated,
+)
+
+
+async def apply_for_job(candidate_data: models.Candidate, db: AsyncSession):
+
+    try:
+        job_id = candidate_data.jobId
+        if not job_id:
+            raise HTTPException(status_code=400, detail="jobId is required")
+
+        # check job exists
+        job = await db.scalar(select(models.Job.id).where(models.Job.id == job_id))
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        # prevent duplicate application by same email for same job
+        existing = await db.scalar(
+            select(models.Candidate.id).where(
+                models.Candidate.email == candidate_data.email,
+                models.Candidate.jobId == job_id
+            )
+        )
+        if existing:
+            raise HTTPException(status_code=400, detail="Already applied for this job")
+
+        new_candidate = new_application(candidate_data)
+        db.add(new_candidate)
+        await db.commit()
+        await db.refresh(new_candidate)
+        on_candidate_applied(new_candidate)
+        return new_candidate
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail=f"Failed to apply for job: {e}")
+
+
+async def list_candidates(db: AsyncSession, job_id: Optional[int] = None, limit: int = 50,
+                          cursor: Optional[str] = None, status: Optional[str] = None,
+                          min_score: Optional[float] = None, max_score: Optional[float] = None):
+    # keyset pagination on (createdAt, id), newest first
+    after = decode_cursor(cursor) if cursor else None
+    try:
+        rows = (await db.scalars(
+            select(models.Candidate)
+            .where(*candidate_filters(job_id, status, min_score, max_score, after))
+            .order_by(models.Candidate.createdAt.desc(), models.Candidate.id.desc())
+            .limit(limit + 1)
+        )).all()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return candidate_page(rows, limit)
+
+
+async def get_candidate(candidate_id: int, db: AsyncSession):
+
+    candidate = await db.get(models.Candidate, candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return candidate
+
+
+async def update_candidate(candidate_id: int, update_data: dict, db: AsyncSession):
+
+    try:
+        cand = await db.get(models.Candidate, candidate_id)
+        if not cand:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+
+        apply_update(cand, update_data)
+        await db.commit()
+        await db.refresh(cand)
+        on_candidate_updated(cand, update_data)
+        return cand
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
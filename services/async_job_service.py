@@ -0,0 +1,72 @@
+# services/async_job_service.py
+# AsyncSession versions of the job_service functions (ASYNC_DB_ENABLED).
+from typing import Optional
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from model import models
+from services.job_service import new_job, on_job_created
+
+
+async def create_job(job_data: models.Job, db: AsyncSession, background_tasks: Optional[BackgroundTasks] = None):
+    try:
+        job = new_job(job_data)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+
+    except Exception as e:
+        await db.rollback()
+        return {"success": False, "message": "Failed to create job", "error": str(e)}
+
+    # TF-IDF / SVD transforms are CPU-bound; talent-pool matching is sync scoring code
+    # that FastAPI runs in the threadpool after the response
+    await run_in_threadpool(on_job_created, job, background_tasks)
+    return job
+
+
+async def list_jobs(db: AsyncSession):
+    """
+    Show all jobs for HR or candidates.
+    """
+    return (await db.scalars(select(models.Job).order_by(models.Job.createdAt.desc()))).all()
+
+
+async def schedule_interview(data: models.Interview, db: AsyncSession):
+    candidate = await db.get(models.Candidate, data.candidateId)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    interview = models.Interview(
+        candidateId=data.candidateId,
+        scheduledAt=data.scheduledAt,
+        interviewer=data.interviewer,
+    )
+
+    db.add(interview)
+    candidate.status = "interview_scheduled"
+    await db.commit()
+    await db.refresh(interview)
+    return interview
+
+
+async def add_feedback(data: models.Feedback, db: AsyncSession):
+    interview = await db.get(models.Interview, data.candidateId)
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    feedback = models.Feedback(
+        candidateId=data.candidateId,
+        interviewer=data.interviewer,
+        rating=data.rating,
+        notes=data.notes
+    )
+
+    db.add(feedback)
+    await db.commit()
+    await db.refresh(feedback)
+
+    return feedback
@@ -4,10 +4,19 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from database import SessionLocal
+import asyncio
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, attributes
+from config import settings
+from database import get_async_db, get_db
 # from models import User
 from model.models import User
+from utils.ttl_cache import TTLCache
 
 
 security = HTTPBearer()
@@ -15,16 +24,56 @@ SECRET_KEY = "jkju987988209m78897*/*5457878678xnum><><:""{2y7nuuiy4343"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# Argon2 is CPU and memory heavy; run it in its own processes so a login storm
+# can't starve the request threads or the event loop
+_hash_pool = None
+# event loop -> Semaphore; asyncio primitives are bound to the loop they are first used on
+_hash_slots = weakref.WeakKeyDictionary()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authenticated principal; enough for role checks without an ORM object."""
+    id: int
+    email: str
+    role: str
+
+
+# principals keyed by token subject (email)
+principal_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+# subject -> time of the last role change; older tokens can't vouch for their role claim.
+# Entries only matter while a token issued before the change can still be valid.
+# Role changes are only known to the process that made them: other workers keep
+# trusting the role claim of older tokens until they expire (ACCESS_TOKEN_EXPIRE_MINUTES).
+_role_changed_at = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def invalidate_user(email: str):
+    principal_cache.pop(email)
+    _role_changed_at.set(email, time.time())
+
+
+@event.listens_for(User.role, "set")
+def _on_role_change(target, value, oldvalue, initiator):
+    # constructing a User sets the role too; oldvalue is then NO_VALUE / NEVER_SET
+    if oldvalue in (attributes.NO_VALUE, attributes.NEVER_SET, None):
+        return
+    if target.email and value != oldvalue:
+        invalidate_user(target.email)
+
+
+def _role_value(role):
+    return role.value if hasattr(role, "value") else str(role)
 
 def hash_password(password: str):
     return pwd_context.hash(password)
@@ -32,32 +81,113 @@ def hash_password(password: str):
 def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    # returns (valid, new_hash); new_hash is set when the stored hash uses old Argon2 parameters
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _get_hash_pool():
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=max(1, settings.PASSWORD_HASH_WORKERS))
+    return _hash_pool
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=True)
+        _hash_pool = None
+
+
+def _get_hash_slots(loop) -> asyncio.Semaphore:
+    slots = _hash_slots.get(loop)
+    if slots is None:
+        slots = _hash_slots[loop] = asyncio.Semaphore(max(1, settings.PASSWORD_HASH_CONCURRENCY))
+    return slots
+
+
+async def _run_hasher(fn, *args):
+    loop = asyncio.get_running_loop()
+    async with _get_hash_slots(loop):
+        return await loop.run_in_executor(_get_hash_pool(), fn, *args)
+
+
+async def hash_password_async(password: str):
+    return await _run_hasher(hash_password, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str):
+    return await _run_hasher(verify_and_update_password, plain_password, hashed_password)
+
 
 
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    to_encode["exp"] = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    now = datetime.utcnow()
+    to_encode["iat"] = now
+    to_encode["exp"] = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    token = credentials.credentials
+def create_user_token(user: User):
+    # role and id ride along as claims so most requests never hit the users table
+    return create_access_token({"sub": user.email, "uid": user.id, "role": _role_value(user.role)})
+
+
+def _principal_from_token(token: str):
+    """(email, principal) from a bearer token; principal is None when the users table must be consulted."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
+    email: str = payload.get("sub")
+    if email is None:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+
+    principal = principal_cache.get(email)
+    if principal:
+        return email, principal
+
+    uid, role, issued_at = payload.get("uid"), payload.get("role"), payload.get("iat", 0)
+    if uid is not None and role and issued_at >= _role_changed_at.get(email, 0):
+        principal = CurrentUser(id=uid, email=email, role=role)
+        principal_cache.set(email, principal)
+        return email, principal
+    # old-style token, or the role changed after it was issued
+    return email, None
+
+
+def _principal_from_user(email: str, user):
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    principal = CurrentUser(id=user.id, email=user.email, role=_role_value(user.role))
+    principal_cache.set(email, principal)
+    return principal
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    email, principal = _principal_from_token(credentials.credentials)
+    if principal:
+        return principal
+    return _principal_from_user(email, db.query(User).filter(User.email == email).first())
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """get_current_user for routes/async_api.py: shares the route's AsyncSession, never the threadpool."""
+    email, principal = _principal_from_token(credentials.credentials)
+    if principal:
+        return principal
+    return _principal_from_user(email, await db.scalar(select(User).where(User.email == email)))
+
 
 def require_role(role: str):
     def role_checker(current_user: User = Depends(get_current_user)):
@@ -69,12 +199,21 @@ def require_role(role: str):
 
 
 
-def require_hr(current_user=Depends(get_current_user)):
-    if current_user.role.lower() != "hr":
-        raise HTTPException(status_code=403, detail="HR access only")
+def _check_role(current_user, role: str, detail: str):
+    if current_user.role.lower() != role:
+        raise HTTPException(status_code=403, detail=detail)
     return current_user
 
+
+def require_hr(current_user=Depends(get_current_user)):
+    return _check_role(current_user, "hr", "HR access only")
+
 def require_candidate(current_user=Depends(get_current_user)):
-    if current_user.role.lower() != "candidate":
-        raise HTTPException(status_code=403, detail="Candidate access only")
-    return current_user
\ No newline at end of file
+    return _check_role(current_user, "candidate", "Candidate access only")
+
+
+async def require_hr_async(current_user=Depends(get_current_user_async)):
+    return _check_role(current_user, "hr", "HR access only")
+
+async def require_candidate_async(current_user=Depends(get_current_user_async)):
+    return _check_role(current_user, "candidate", "Candidate access only")
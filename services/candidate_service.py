@@ -1,14 +1,89 @@
 # services/candidate_service.py
-import json
-import re
+import base64
+from datetime import datetime
+from pydantic import ValidationError
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from config import settings
 from master import extract_text
 from model import models
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
+import schemas
 from utils.orm_utils import sqlalchemy_obj_to_dict  # see utils below
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from utils.keyword_matcher import KeywordMatcher
+from utils.metrics import record_stage, span
+from utils.resume_features import FEATURE_COLUMNS, FEATURES_VERSION, education_score, extract_features
+from services.tfidf_index import tfidf_index
+from services.semantic_index import semantic_index
+from services.search_index import resume_search_index
+from services.skill_index import skill_index
+from services.duplicate_index import duplicate_index
+from services.scoring_service import (
+    DEFAULT_REQUIRED_EDUCATION, DEFAULT_REQUIRED_YEARS, ensure_features, load_scoring_context, scoring_config_cache,
+    topk_cache,
+)
+
+
+# ---------- shared with services/async_candidate_service.py ----------
+UPDATABLE_FIELDS = {"firstName", "lastName", "phone", "status", "score", "scoreBreakdown", "email"}
+
+
+def new_application(candidate_data) -> models.Candidate:
+    return models.Candidate(
+        firstName=candidate_data.firstName,
+        lastName=candidate_data.lastName,
+        email=candidate_data.email,
+        phone=candidate_data.phone,
+        jobId=candidate_data.jobId,
+        status="applied"
+    )
+
+
+def on_candidate_applied(candidate: models.Candidate):
+    """After the new candidate is committed."""
+    skill_index.invalidate(candidate.jobId)
+
+
+def candidate_filters(job_id=None, status=None, min_score=None, max_score=None, after=None):
+    """WHERE clauses for list_candidates; `after` is a decoded (createdAt, id) cursor."""
+    filters = []
+    if job_id:
+        filters.append(models.Candidate.jobId == job_id)
+    if status:
+        filters.append(models.Candidate.status == status)
+    if min_score is not None:
+        filters.append(models.Candidate.score >= min_score)
+    if max_score is not None:
+        filters.append(models.Candidate.score <= max_score)
+    if after:
+        filters.append(tuple_(models.Candidate.createdAt, models.Candidate.id) < after)
+    return filters
+
+
+def candidate_page(rows, limit: int):
+    """Page from up to limit + 1 rows in cursor order."""
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.createdAt, last.id)
+    return {"items": items, "nextCursor": next_cursor}
+
+
+def apply_update(cand: models.Candidate, update_data: dict):
+    for k, v in update_data.items():
+        if k in UPDATABLE_FIELDS:
+            setattr(cand, k, v)
+
+
+def on_candidate_updated(cand: models.Candidate, update_data: dict):
+    """After the update is committed."""
+    if "score" in update_data:
+        topk_cache.invalidate(cand.jobId)
+
 
 def apply_for_job(candidate_data: models.Candidate, db: Session):
     
@@ -30,17 +105,11 @@ def apply_for_job(candidate_data: models.Candidate, db: Session):
         if existing:
             raise HTTPException(status_code=400, detail="Already applied for this job")
 
-        new_candidate = models.Candidate(
-            firstName=candidate_data.firstName,
-            lastName=candidate_data.lastName,
-            email=candidate_data.email,
-            phone=candidate_data.phone,
-            jobId=job_id,
-            status="applied"
-        )
+        new_candidate = new_application(candidate_data)
         db.add(new_candidate)
         db.commit()
         db.refresh(new_candidate)
+        on_candidate_applied(new_candidate)
         return new_candidate
 
     except HTTPException:
@@ -51,15 +120,151 @@ def apply_for_job(candidate_data: models.Candidate, db: Session):
                             detail=f"Failed to apply for job: {e}")
 
 
-def list_candidates(db: Session, job_id: Optional[int] = None):
-   
+def _insert_candidates(mappings, db: Session):
+    """
+    Insert candidate rows, skipping emails that already exist. Returns the set
+    of emails actually inserted. Postgres/SQLite use INSERT ... ON CONFLICT DO
+    NOTHING RETURNING; other databases fall back to bulk_insert_mappings.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = (
+            insert(models.Candidate)
+            .on_conflict_do_nothing(index_elements=[models.Candidate.email])
+            .returning(models.Candidate.email)
+        )
+        return set(db.scalars(stmt, mappings).all())
+    db.bulk_insert_mappings(models.Candidate, mappings)
+    return {m["email"] for m in mappings}
+
+
+def import_candidates(rows: Iterable, db: Session, default_job_id: Optional[int] = None,
+                      batch_size: int = settings.IMPORT_BATCH_SIZE,
+                      max_errors: int = settings.IMPORT_MAX_ERRORS):
+    """
+    Bulk-create candidates from (row number, row dict, parse error) tuples, as
+    produced by utils.bulk_import.iter_rows.
+
+    Rows are validated against CandidateCreate and written in batches: one query
+    for unknown job ids, one for already registered emails and one INSERT per
+    batch. Invalid or duplicate rows are reported, the rest are imported.
+    """
+    report = {"total": 0, "imported": 0, "failed": 0, "errors": [], "errorsTruncated": False}
+    known_jobs: Dict[int, bool] = {}
+    seen_emails = set()
+    batch = []
+
+    def fail(number, email, messages):
+        report["failed"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"row": number, "email": email, "errors": messages})
+        else:
+            report["errorsTruncated"] = True
+
+    def flush():
+        new_jobs = {data.jobId for _, data in batch} - known_jobs.keys()
+        if new_jobs:
+            found = {job_id for (job_id,) in db.query(models.Job.id).filter(models.Job.id.in_(new_jobs))}
+            known_jobs.update({job_id: job_id in found for job_id in new_jobs})
+
+        emails = [data.email for _, data in batch]
+        registered = {email for (email,) in
+                      db.query(models.Candidate.email).filter(models.Candidate.email.in_(emails))}
+
+        pending = {}
+        for number, data in batch:
+            if not known_jobs[data.jobId]:
+                fail(number, data.email, ["Job not found"])
+            elif data.email in registered:
+                fail(number, data.email, ["A candidate with this email already exists"])
+            else:
+                pending[data.email] = (number, {
+                    "firstName": data.firstName,
+                    "lastName": data.lastName,
+                    "email": data.email,
+                    "phone": data.phone,
+                    "jobId": data.jobId,
+                    "status": "applied",
+                })
+        batch.clear()
+        if not pending:
+            return
+
+        try:
+            inserted = _insert_candidates([mapping for _, mapping in pending.values()], db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            for email, (number, _) in pending.items():
+                fail(number, email, [f"Insert failed: {e}"])
+            return
+        report["imported"] += len(inserted)
+        for job_id in {mapping["jobId"] for email, (_, mapping) in pending.items() if email in inserted}:
+            skill_index.invalidate(job_id)
+        # registered by someone else between our check and the insert
+        for email, (number, _) in pending.items():
+            if email not in inserted:
+                fail(number, email, ["A candidate with this email already exists"])
+
+    for number, row, error in rows:
+        report["total"] += 1
+        if error:
+            fail(number, None, [error])
+            continue
+        if default_job_id is not None and not row.get("jobId"):
+            row["jobId"] = default_job_id
+        try:
+            data = schemas.CandidateCreate.model_validate(row)
+        except ValidationError as e:
+            fail(number, row.get("email"),
+                 [f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()])
+            continue
+
+        data.email = data.email.strip()
+        if data.email in seen_emails:
+            fail(number, data.email, ["Duplicate email in file"])
+            continue
+        seen_emails.add(data.email)
+
+        batch.append((number, data))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    report["errors"].sort(key=lambda err: err["row"])
+    return report
+
+
+def encode_cursor(created_at: datetime, candidate_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{candidate_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, candidate_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(candidate_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def list_candidates(db: Session, job_id: Optional[int] = None, limit: int = 50, cursor: Optional[str] = None,
+                    status: Optional[str] = None, min_score: Optional[float] = None,
+                    max_score: Optional[float] = None):
+    # keyset pagination on (createdAt, id), newest first
+    after = decode_cursor(cursor) if cursor else None
     try:
-        q = db.query(models.Candidate).order_by(models.Candidate.createdAt.desc())
-        if job_id:
-            q = q.filter(models.Candidate.jobId == job_id)
-        return q.all()
+        rows = (
+            db.query(models.Candidate)
+            .filter(*candidate_filters(job_id, status, min_score, max_score, after))
+            .order_by(models.Candidate.createdAt.desc(), models.Candidate.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return candidate_page(rows, limit)
 
 
 def get_candidate(candidate_id: int, db: Session):
@@ -77,12 +282,10 @@ def update_candidate(candidate_id: int, update_data: dict, db: Session):
         if not cand:
             raise HTTPException(status_code=404, detail="Candidate not found")
 
-        allowed = {"firstName", "lastName", "phone", "status", "score", "scoreBreakdown", "email"}
-        for k, v in update_data.items():
-            if k in allowed:
-                setattr(cand, k, v)
+        apply_update(cand, update_data)
         db.commit()
         db.refresh(cand)
+        on_candidate_updated(cand, update_data)
         return cand
     except HTTPException:
         raise
@@ -91,38 +294,112 @@ def update_candidate(candidate_id: int, update_data: dict, db: Session):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def parse_resume(candidate_id: int, db: Session):
+def latest_resume(candidate_id: int, db: Session):
+    return (
+        db.query(models.ResumeFile)
+        .filter(models.ResumeFile.candidateId == candidate_id)
+        .order_by(models.ResumeFile.id.desc())
+        .first()
+    )
+
+
+def get_cached_extraction(sha256: Optional[str], db: Session):
+    if not sha256:
+        return None
+    return db.query(models.ResumeExtraction).filter(models.ResumeExtraction.sha256 == sha256).first()
+
+
+def parse_resume(candidate_id: int, db: Session, parsed_text: Optional[str] = None,
+                 resume_id: Optional[int] = None, features: Optional[Dict[str, Any]] = None):
     # Candidate aur resume fetch karo
     candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
-    if not candidate or not candidate.resume:
+    resume = None
+    if candidate and resume_id is not None:
+        resume = db.query(models.ResumeFile).filter(
+            models.ResumeFile.id == resume_id,
+            models.ResumeFile.candidateId == candidate_id
+        ).first()
+    elif candidate:
+        resume = latest_resume(candidate_id, db)
+    if not candidate or not resume:
         raise HTTPException(status_code=404, detail="Candidate or resume not found")
 
-    # file_path = candidate.resume.path
-    file_path = candidate.resume.path
-
-    parsed_text = extract_text(file_path)
-   
-
-    if parsed_text.strip() == "" or parsed_text == "Unsupported file format.":
-        raise HTTPException(status_code=400, detail="Unable to extract text from resume")
+    # identical files are only parsed once
+    cached = get_cached_extraction(resume.sha256, db)
+    if cached:
+        parsed_text, keywords = cached.text, cached.keywords or []
+        features = cached.features
+        if not features or features.get("featuresVersion") != FEATURES_VERSION:
+            features = extract_features(parsed_text)
+            cached.features = features
+        # entries cached before a feature was dropped may still carry it
+        features = {column: features.get(column) for column in FEATURE_COLUMNS}
+    else:
+        # text (and features) may already have been extracted by the background worker
+        if parsed_text is None:
+            ocr_timings = {}
+            parsed_text = extract_text(resume.path, ocr_timings)
+            for stage, seconds in ocr_timings.items():
+                record_stage("ocr", stage, seconds)
+
+        if parsed_text.strip() == "" or parsed_text == "Unsupported file format.":
+            raise HTTPException(status_code=400, detail="Unable to extract text from resume")
+
+        with span("parse_resume", "keyword_match"):
+            keywords = extract_keywords(parsed_text)
+        if features is None:
+            with span("parse_resume", "features"):
+                features = extract_features(parsed_text)
+
+    with span("parse_resume", "minhash"):
+        signature = duplicate_index.signature(parsed_text)
+    minhash = signature.tobytes() if signature is not None else b""
 
-    keywords = extract_keywords(parsed_text)
-   
     parsed = models.ResumeParsed(
         candidateId=candidate_id,
         text=parsed_text,
-        keywords=keywords
+        keywords=keywords,
+        minhash=minhash,
+        **features
     )
-
     db.add(parsed)
-    db.commit()
+
+    if not cached and resume.sha256:
+        db.add(models.ResumeExtraction(sha256=resume.sha256, text=parsed_text, keywords=keywords,
+                                       features=features))
+    # near-duplicates of other candidates' latest resumes (LSH candidates only)
+    with span("parse_resume", "duplicates"):
+        duplicates = duplicate_index.find(candidate_id, signature, db)
+
+    try:
+        with span("parse_resume", "db_commit"):
+            db.flush()
+            resume_search_index.index(parsed, db)
+            skills = skill_index.sync_candidate(candidate_id, keywords, db)
+            duplicate_index.record(candidate_id, duplicates, db)
+            db.commit()
+    except IntegrityError:
+        # another worker cached the same file first; keep our parsed row only
+        db.rollback()
+        parsed = models.ResumeParsed(candidateId=candidate_id, text=parsed_text, keywords=keywords,
+                                     minhash=minhash, **features)
+        db.add(parsed)
+        db.flush()
+        resume_search_index.index(parsed, db)
+        skills = skill_index.sync_candidate(candidate_id, keywords, db)
+        duplicate_index.record(candidate_id, duplicates, db)
+        db.commit()
+
     db.refresh(parsed)
-    return {"message": "Resume parsed successfully", "keywords": keywords}
+    skill_index.record(candidate.jobId, candidate_id, skills)
+    duplicate_index.add(candidate_id, signature)
+    tfidf_index.add_resume()
+    return {"message": "Resume parsed successfully", "keywords": keywords, "cached": bool(cached),
+            "duplicates": [{"candidateId": other, "similarity": score} for other, score in duplicates]}
 
 
-def extract_keywords(text: str):
-    # simple tech keyword list (you can expand later)
-    tech_keywords = [
+# simple tech keyword list (you can expand later)
+TECH_KEYWORDS = [
     # --- General Purpose Languages ---
     "python", "java", "javascript", "typescript", "c", "c++", "c#", "go", "rust", "kotlin", "swift",
     "ruby", "perl", "php", "r", "dart", "scala", "lua", "objective-c", "haskell", "elixir",
@@ -170,43 +447,34 @@ def extract_keywords(text: str):
 
     # --- Others ---
     "vim", "emacs", "vscode",    "intellij", "jira", "confluence", "notion"
-    ]
+]
 
-    found = [kw for kw in tech_keywords if kw.lower() in text.lower()]
-    return found
+# compiled once at import; finds every keyword in one pass over the resume
+KEYWORD_MATCHER = KeywordMatcher(TECH_KEYWORDS)
+
+
+def extract_keywords(text: str):
+    return KEYWORD_MATCHER.extract(text)
 
 
 
 def calculate_resume_score(candidate_id: int, db: Session):
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+    # candidate, latest parse and job in a single query
+    candidate, parsed, job = load_scoring_context(candidate_id, db)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
-    parsed = db.query(models.ResumeParsed).filter(models.ResumeParsed.candidateId == candidate_id).first()
-    if not parsed or not parsed.text:
+    if not parsed:
+        raise HTTPException(status_code=404, detail="Parsed resume not found")
+    ensure_features(parsed)
+    if not parsed.termCounts:
         raise HTTPException(status_code=404, detail="Parsed resume not found")
 
-    job = db.query(models.Job).filter(models.Job.id == candidate.jobId).first()
     if not job or not job.description:
         raise HTTPException(status_code=404, detail="Job description not found")
 
-    # ⚙️ Load scoring configuration (or defaults)
-    config = db.query(models.ScoringConfig).order_by(models.ScoringConfig.updatedAt.desc()).first()
-    if config and config.config:
-        config_data = json.loads(config.config)
-        weights = config_data.get("weights", {
-            "keywords": 0.45,
-            "tfidf": 0.35,
-            "experience": 0.15,
-            "education": 0.05
-        })
-    else:
-        weights = {
-            "keywords": 0.45,
-            "tfidf": 0.35,
-            "experience": 0.15,
-            "education": 0.05
-        }
+    # ⚙️ Scoring configuration (cached in-process, defaults if none stored)
+    config_version, weights = scoring_config_cache.get(db)
 
     # ========== 1️⃣ Keyword Matching ==========
     job_keywords = [kw.lower() for kw in (job.scoringKeywords or [])]
@@ -216,56 +484,68 @@ def calculate_resume_score(candidate_id: int, db: Session):
     keyword_score = min(1, len(matched) / len(job_keywords)) if job_keywords else 0
 
     # ========== 2️⃣ TF-IDF Similarity ==========
+    # job vectors are precomputed by the shared index; the resume vector comes from stored term counts
     try:
-        vectorizer = TfidfVectorizer(stop_words="english")
-        tfidf = vectorizer.fit_transform([parsed.text, job.description])
-        # print("tdidf",tfidf)
-        tfidf_similarity = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
-        # print("similarity",tfidf_similarity)
+        with span("calculate_resume_score", "tfidf"):
+            tfidf_similarity = tfidf_index.similarity_from_counts(db, job, parsed.termCounts)
     except Exception:
         tfidf_similarity = 0
 
-    # ========== 3️⃣ Experience Extraction ==========
-    def extract_experience_years(text):
-        match = re.search(r"(\d+)\s*(?:years|yrs|year)", text.lower())
-        if match:
-            return int(match.group(1))
-        return 0
+    # ========== 3️⃣ Latent Semantic Similarity ==========
+    # one LSA projection of the resume, dot product against the precomputed job embeddings
+    try:
+        with span("calculate_resume_score", "semantic"):
+            semantic_similarity = semantic_index.similarity(db, job, parsed.termCounts)
+    except Exception:
+        semantic_similarity = 0
 
-    experience_years = extract_experience_years(parsed.text)
-    required_years = getattr(job, "requiredExperience", 3)
+    # ========== 4️⃣ Experience and education (extracted at parse time) ==========
+    experience_years = parsed.experienceYears or 0
+    required_years = getattr(job, "requiredExperience", DEFAULT_REQUIRED_YEARS)
     experience_score = max(0, min(1, (experience_years - required_years) / 5))
+    education_level = parsed.educationLevel
+    education = education_score(education_level, getattr(job, "requiredEducation", DEFAULT_REQUIRED_EDUCATION))
 
-    # ========== 4️⃣ Final Weighted Score ==========
+    # ========== 5️⃣ Final Weighted Score ==========
     final_score = (
         weights["keywords"] * keyword_score +
         weights["tfidf"] * tfidf_similarity +
-        weights["experience"] * experience_score
+        weights.get("semantic", 0) * semantic_similarity +
+        weights["experience"] * experience_score +
+        weights.get("education", 0) * education
     )
 
     final_score_percent = round(final_score * 100, 2)
 
-    # ========== 5️⃣ Save + Breakdown ==========
+    # ========== 6️⃣ Save + Breakdown ==========
     breakdown = {
         "keyword_score": round(keyword_score, 2),
         "tfidf_similarity": round(tfidf_similarity, 2),
+        "semantic_similarity": round(semantic_similarity, 2),
         "experience_score": round(experience_score, 2),
+        "education_score": round(education, 2),
         "weights": weights,
+        "weights_version": config_version,
         "matched_keywords": matched,
         "experience_years": experience_years,
+        "education_level": education_level,
         "final_score": final_score_percent
     }
 
     explanation = (
         f"Matched keywords: {matched}. "
         f"TF-IDF similarity={tfidf_similarity:.2f}. "
-        f"Experience ≈ {experience_years} yrs → score +{experience_score:.2f}"
+        f"Semantic similarity={semantic_similarity:.2f}. "
+        f"Experience ≈ {experience_years} yrs → score +{experience_score:.2f}. "
+        f"Education: {education_level or 'not found'} → score +{education:.2f}"
     )
 
     candidate.score = float(final_score_percent)
     candidate.scoreBreakdown = breakdown
-    db.commit()
-    db.refresh(candidate)
+    job_id = candidate.jobId
+    with span("calculate_resume_score", "db_commit"):
+        db.commit()
+    topk_cache.record(job_id, candidate_id, float(final_score_percent))
 
     return {
         "message": "Resume scored successfully",
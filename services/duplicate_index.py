@@ -0,0 +1,186 @@
+# services/duplicate_index.py
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session, aliased, contains_eager
+
+from config import settings
+from model import models
+from utils import minhash
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate resume detection with MinHash + LSH.
+
+    parse_resume computes a MinHash signature over the resume's word shingles
+    and stores it on resume_parsed. The signatures of every candidate's latest
+    parse are held in memory, split into LSH bands; a new resume is compared
+    only with candidates sharing at least one band bucket, so a check costs
+    O(bands) lookups plus a handful of comparisons instead of a scan. Bands
+    and rows are chosen so a pair at the Jaccard threshold shares a bucket
+    with 95% probability (utils/minhash.lsh_params). The in-memory index is
+    rebuilt after DUPLICATE_INDEX_TTL_SECONDS to pick up resumes parsed by
+    other processes.
+    """
+
+    def __init__(self, threshold: float = settings.DUPLICATE_JACCARD_THRESHOLD,
+                 num_perm: int = settings.MINHASH_PERMUTATIONS,
+                 shingle_size: int = settings.MINHASH_SHINGLE_SIZE,
+                 ttl: float = settings.DUPLICATE_INDEX_TTL_SECONDS):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.ttl = ttl
+        self.bands, self.rows = minhash.lsh_params(num_perm, threshold)
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = defaultdict(set)
+        self._signatures: Dict[int, np.ndarray] = {}  # candidate id -> signature of its latest parse
+        self._built_at: Optional[float] = None
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        return minhash.signature(minhash.shingles(text, self.shingle_size), self.num_perm)
+
+    def _keys(self, sig: np.ndarray):
+        return [(band, sig[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _decode(self, raw) -> Optional[np.ndarray]:
+        sig = np.frombuffer(raw, dtype=np.uint32) if raw else None
+        # signatures written with another MINHASH_PERMUTATIONS can't be compared
+        return sig if sig is not None and len(sig) == self.num_perm else None
+
+    # ---------- index maintenance ----------
+    def _ensure_built(self, db: Session):
+        if self._built_at is not None and time.monotonic() - self._built_at <= self.ttl:
+            return
+        latest_parsed_id = (
+            select(func.max(models.ResumeParsed.id))
+            .where(models.ResumeParsed.candidateId == models.Candidate.id)
+            .correlate(models.Candidate)
+            .scalar_subquery()
+        )
+        rows = (
+            db.query(models.Candidate.id, models.ResumeParsed.minhash)
+            .join(models.ResumeParsed, models.ResumeParsed.id == latest_parsed_id)
+            .filter(models.ResumeParsed.minhash.isnot(None))
+            .all()
+        )
+        buckets, signatures = defaultdict(set), {}
+        for candidate_id, raw in rows:
+            sig = self._decode(raw)
+            if sig is None:
+                continue
+            signatures[candidate_id] = sig
+            for key in self._keys(sig):
+                buckets[key].add(candidate_id)
+        with self._lock:
+            self._buckets, self._signatures = buckets, signatures
+            self._built_at = time.monotonic()
+
+    def _remove(self, candidate_id: int):
+        old = self._signatures.pop(candidate_id, None)
+        if old is not None:
+            for key in self._keys(old):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(candidate_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def add(self, candidate_id: int, sig: Optional[np.ndarray]):
+        """Called after the parse is committed; replaces the candidate's previous signature."""
+        with self._lock:
+            if self._built_at is None:
+                return  # built from the database on first use
+            self._remove(candidate_id)
+            if sig is not None:
+                self._signatures[candidate_id] = sig
+                for key in self._keys(sig):
+                    self._buckets[key].add(candidate_id)
+
+    def backfill(self, db: Session, batch_size: int = 500) -> int:
+        """Compute signatures for resumes parsed before they existed. Run at startup."""
+        filled = 0
+        while True:
+            rows = (
+                db.query(models.ResumeParsed.id, models.ResumeParsed.text)
+                .filter(models.ResumeParsed.minhash.is_(None))
+                .order_by(models.ResumeParsed.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            updates = []
+            for parsed_id, text in rows:
+                sig = self.signature(text)
+                # no words: store an empty value so the row isn't picked up again
+                updates.append({"id": parsed_id, "minhash": sig.tobytes() if sig is not None else b""})
+            db.execute(update(models.ResumeParsed), updates)
+            db.commit()
+            filled += len(rows)
+        if filled:
+            logger.info("🧬 Computed MinHash signatures for %d parsed resumes", filled)
+            with self._lock:
+                self._built_at = None
+        return filled
+
+    # ---------- queries ----------
+    def find(self, candidate_id: int, sig: Optional[np.ndarray], db: Session) -> List[Tuple[int, float]]:
+        """(other candidate id, estimated Jaccard) at or above the threshold, most similar first."""
+        if sig is None:
+            return []
+        self._ensure_built(db)
+        with self._lock:
+            matches = set()
+            for key in self._keys(sig):
+                matches |= self._buckets.get(key, set())
+            matches.discard(candidate_id)
+            if not matches:
+                return []
+            ids = sorted(matches)
+            others = np.stack([self._signatures[cid] for cid in ids])
+        scores = minhash.similarity(sig, others)
+        found = [(cid, round(float(s), 4)) for cid, s in zip(ids, scores) if s >= self.threshold]
+        return sorted(found, key=lambda item: (-item[1], item[0]))
+
+    def record(self, candidate_id: int, matches: List[Tuple[int, float]], db: Session):
+        """Replace the candidate's stored duplicate matches; committed by the caller."""
+        db.execute(delete(models.ResumeDuplicate).where(models.ResumeDuplicate.candidateId == candidate_id))
+        if matches:
+            db.execute(insert(models.ResumeDuplicate), [
+                {"candidateId": candidate_id, "duplicateOfId": other, "similarity": score}
+                for other, score in matches
+            ])
+
+
+duplicate_index = DuplicateIndex()
+
+
+def duplicates_report(db: Session, min_similarity: float = settings.DUPLICATE_JACCARD_THRESHOLD,
+                      job_id: Optional[int] = None, limit: int = 100, offset: int = 0):
+    """Detected near-duplicate pairs, most similar first; `job_id` matches either side."""
+    duplicate_of = aliased(models.Candidate)
+    q = (
+        db.query(models.ResumeDuplicate)
+        .join(models.ResumeDuplicate.candidate)
+        .join(duplicate_of, models.ResumeDuplicate.duplicateOf)
+        .options(contains_eager(models.ResumeDuplicate.candidate),
+                 contains_eager(models.ResumeDuplicate.duplicateOf, alias=duplicate_of))
+        .filter(models.ResumeDuplicate.similarity >= min_similarity)
+    )
+    if job_id is not None:
+        q = q.filter((models.Candidate.jobId == job_id) | (duplicate_of.jobId == job_id))
+    return (
+        q.order_by(models.ResumeDuplicate.similarity.desc(), models.ResumeDuplicate.id.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
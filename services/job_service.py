@@ -1,20 +1,49 @@
-from fastapi import HTTPException
+import logging
+from typing import Optional
+from fastapi import BackgroundTasks, HTTPException
 from sqlalchemy.orm import Session
+from config import settings
 from model import models
+from services.semantic_index import semantic_index
+from services.talent_pool import suggest_for_job
+from services.tfidf_index import tfidf_index
 
 from utils.orm_utils import sqlalchemy_obj_to_dict
 
-def create_job(job_data : models.Job, db: Session):
+logger = logging.getLogger(__name__)
+
+# ---------- shared with services/async_job_service.py ----------
+def new_job(job_data) -> models.Job:
+    return models.Job(
+        title=job_data.title,
+        description=job_data.description,
+        scoringKeywords=job_data.scoringKeywords
+    )
+
+
+def on_job_created(job: models.Job, background_tasks: Optional[BackgroundTasks] = None):
+    """
+    After the new job is committed: add it to the scoring indexes and queue
+    talent-pool matching. CPU-bound (TF-IDF and SVD transforms); async callers
+    run it in the threadpool. The job is saved either way, so index failures
+    are only logged: scoring picks the job up on first use or at the next refit.
+    """
     try:
-        new_job = models.Job(
-            title=job_data.title,
-            description=job_data.description,
-            scoringKeywords=job_data.scoringKeywords
-        )
-        db.add(new_job)
+        tfidf_index.add_job(job)
+        semantic_index.add_job(job)
+    except Exception:
+        logger.exception("failed to index new job %s", job.id)
+    if background_tasks is not None and settings.TALENT_POOL_SUGGESTIONS:
+        # match past applicants against the new job after the response is sent
+        background_tasks.add_task(suggest_for_job, job.id)
+
+
+def create_job(job_data : models.Job, db: Session, background_tasks: Optional[BackgroundTasks] = None):
+    try:
+        job = new_job(job_data)
+        db.add(job)
         db.commit()
-        db.refresh(new_job)
-        return new_job
+        db.refresh(job)
         # job_dict = sqlalchemy_obj_to_dict(new_job)
         # print("job dict", job_dict)
         # return {"success": True, "message": "Job created successfully", "data": job_dict}
@@ -23,6 +52,9 @@ def create_job(job_data : models.Job, db: Session):
         db.rollback()
         return {"success": False, "message": "Failed to create job", "error": str(e)}
 
+    on_job_created(job, background_tasks)
+    return job
+
 
 def list_jobs(db: Session):
     """
@@ -0,0 +1,301 @@
+# services/resume_worker.py
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from master import extract_text
+from model import models
+from services import candidate_service as CandidateService
+from utils.metrics import record_stage
+from utils.ocr import init_ocr_worker, tesseract_slots
+from utils.resume_features import extract_features
+from utils.text_extraction import cpu_slot, share_cpu_slots
+
+logger = logging.getLogger(__name__)
+
+
+def _init_pool_process(ocr_slots, cpu_slots):
+    init_ocr_worker(ocr_slots)
+    # large PDFs spread over the slots of idle pool processes; see extract_pdf_text
+    share_cpu_slots(cpu_slots)
+
+
+def extract_resume(path: str):
+    """
+    Process-pool job: text plus precomputed scoring features, both CPU-bound.
+    Task and OCR stage timings are returned so the parent process can record them.
+    """
+    with cpu_slot():
+        start = time.perf_counter()
+        ocr_timings = {}
+        text = extract_text(path, ocr_timings)
+        timings = {"extract": time.perf_counter() - start}
+        if text.strip() == "" or text == "Unsupported file format.":
+            return text, None, timings, ocr_timings
+        start = time.perf_counter()
+        features = extract_features(text)
+        timings["features"] = time.perf_counter() - start
+        return text, features, timings, ocr_timings
+
+
+def enqueue_resume(candidate_id: int, resume_id: int, db: Session):
+    task = models.ResumeTask(candidateId=candidate_id, resumeId=resume_id, status="queued")
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    resume_worker.wake()
+    return task
+
+
+def get_task(task_id: int, db: Session, current_user=None):
+    """
+    A resume task, visible to HR and to the candidate it belongs to (the
+    candidate record with the user's email). Anyone else gets a 404, so task
+    ids can't be probed.
+    """
+    row = (
+        db.query(models.ResumeTask, models.Candidate.email)
+        .join(models.Candidate, models.Candidate.id == models.ResumeTask.candidateId)
+        .filter(models.ResumeTask.id == task_id)
+        .first()
+    )
+    if not row:
+        raise HTTPException(status_code=404, detail="Task not found")
+    task, owner_email = row
+    if current_user is not None and current_user.role.lower() != "hr" \
+            and (owner_email or "").lower() != current_user.email.lower():
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+class ResumeWorker:
+    """
+    Parses and scores uploaded resumes outside the request.
+
+    `resume_tasks` is the queue: a dispatcher thread claims queued rows, runs the
+    CPU-heavy `extract_text` (PDF parsing, Tesseract OCR) and feature extraction
+    in a process pool and then stores the parsed resume and score. At most
+    `concurrency` tasks run at once.
+
+    Several server processes may run a worker against the same table. A task is
+    claimed with a conditional UPDATE (status still `queued`), which is atomic
+    on SQLite too, and carries a lease (claimedBy, leaseUntil) that the
+    dispatcher renews while the task runs. Only tasks whose lease has expired,
+    i.e. whose worker died, are put back in the queue.
+    """
+
+    def __init__(self, concurrency: int = settings.RESUME_WORKER_CONCURRENCY,
+                 poll_seconds: float = settings.RESUME_WORKER_POLL_SECONDS,
+                 lease_seconds: float = settings.RESUME_TASK_LEASE_SECONDS):
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pool = None
+        self._finisher = None
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        self._renewed_at = 0.0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._requeue_expired()
+
+        self._stopping.clear()
+        # OCR in every pool process draws from the same OCR_MAX_PROCESSES slots, and
+        # a document's page ranges only use the CPU slots of idle pool processes
+        cpu_slots = multiprocessing.BoundedSemaphore(self.concurrency)
+        self._pool = ProcessPoolExecutor(max_workers=self.concurrency, initializer=_init_pool_process,
+                                         initargs=(tesseract_slots(), cpu_slots))
+        self._finisher = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="resume-finish")
+        self._thread = threading.Thread(target=self._run, name="resume-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+        self._finisher.shutdown(wait=True)
+        self._thread = None
+        self._pool = None
+        self._finisher = None
+
+    def wake(self):
+        self._wakeup.set()
+
+    # ---------- leases ----------
+    def _lease_until(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    def _requeue_expired(self):
+        """Put back `processing` tasks whose worker stopped renewing their lease (or predate leases)."""
+        db = SessionLocal()
+        try:
+            requeued = db.query(models.ResumeTask).filter(
+                models.ResumeTask.status == "processing",
+                or_(models.ResumeTask.leaseUntil.is_(None), models.ResumeTask.leaseUntil < datetime.utcnow()),
+            ).update({"status": "queued", "claimedBy": None, "leaseUntil": None}, synchronize_session=False)
+            db.commit()
+            if requeued:
+                logger.warning("re-queued %s resume tasks with expired leases", requeued)
+        finally:
+            db.close()
+
+    def _renew_leases(self):
+        with self._in_flight_lock:
+            task_ids = list(self._in_flight)
+        if not task_ids:
+            return
+        db = SessionLocal()
+        try:
+            db.query(models.ResumeTask).filter(
+                models.ResumeTask.id.in_(task_ids), models.ResumeTask.claimedBy == self.owner
+            ).update({"leaseUntil": self._lease_until()}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _maintain_leases(self):
+        # renew well before expiry; also pick up tasks orphaned by workers that died meanwhile
+        if time.monotonic() - self._renewed_at < self.lease_seconds / 3:
+            return
+        self._renewed_at = time.monotonic()
+        try:
+            self._renew_leases()
+            self._requeue_expired()
+        except Exception:
+            logger.exception("resume task lease upkeep failed")
+
+    # ---------- dispatcher ----------
+    def _run(self):
+        while not self._stopping.is_set():
+            self._maintain_leases()
+            claimed = self._dispatch()
+            if not claimed:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+
+    def _dispatch(self) -> int:
+        claimed = 0
+        while not self._stopping.is_set() and self._slots.acquire(blocking=False):
+            task = self._claim_next()
+            if task is None:
+                self._slots.release()
+                break
+            task_id, candidate_id, resume_id, path, cached = task
+            if cached:
+                # already extracted once; no need to go through the process pool
+                self._finisher.submit(self._finish, task_id, candidate_id, resume_id, None)
+            else:
+                future = self._pool.submit(extract_resume, path)
+                future.add_done_callback(
+                    lambda f, args=(task_id, candidate_id, resume_id): self._on_extracted(*args, f)
+                )
+            claimed += 1
+        return claimed
+
+    def _claim_next(self):
+        db = SessionLocal()
+        try:
+            while True:
+                task_id = (
+                    db.query(models.ResumeTask.id)
+                    .filter(models.ResumeTask.status == "queued")
+                    .order_by(models.ResumeTask.id)
+                    .with_for_update(skip_locked=True)
+                    .limit(1)
+                    .scalar()
+                )
+                if task_id is None:
+                    return None
+                # only one dispatcher's UPDATE can still see the row queued
+                claimed = db.query(models.ResumeTask).filter(
+                    models.ResumeTask.id == task_id, models.ResumeTask.status == "queued"
+                ).update({"status": "processing", "claimedBy": self.owner, "leaseUntil": self._lease_until()},
+                         synchronize_session=False)
+                db.commit()
+                if not claimed:
+                    continue  # another worker got it first
+
+                task = db.query(models.ResumeTask).filter(models.ResumeTask.id == task_id).one()
+                resume = db.query(models.ResumeFile).filter(models.ResumeFile.id == task.resumeId).first()
+                if resume is None:
+                    task.status = "failed"
+                    task.error = "Resume file not found"
+                    db.commit()
+                    continue
+                cached = CandidateService.get_cached_extraction(resume.sha256, db) is not None
+                with self._in_flight_lock:
+                    self._in_flight.add(task.id)
+                return task.id, task.candidateId, resume.id, resume.path, cached
+        finally:
+            db.close()
+
+    def _on_extracted(self, task_id: int, candidate_id: int, resume_id: int, future):
+        # pool callbacks run on the executor's manager thread; hand DB work off
+        self._finisher.submit(self._finish, task_id, candidate_id, resume_id, future)
+
+    def _finish(self, task_id: int, candidate_id: int, resume_id: int, future):
+        db = SessionLocal()
+        try:
+            task = db.query(models.ResumeTask).filter(models.ResumeTask.id == task_id).first()
+            if task.claimedBy != self.owner:
+                # our lease expired and another worker re-ran the task; leave its result alone
+                logger.warning("resume task %s was taken over by %s", task_id, task.claimedBy)
+                return
+            try:
+                parsed_text, features, timings, ocr_timings = (
+                    future.result() if future is not None else (None, None, {}, {}))
+                for stage, seconds in timings.items():
+                    record_stage("resume_task", stage, seconds)
+                for stage, seconds in ocr_timings.items():
+                    record_stage("ocr", stage, seconds)
+                parsed_data = CandidateService.parse_resume(
+                    candidate_id, db, parsed_text=parsed_text, resume_id=resume_id, features=features
+                )
+                score_data = CandidateService.calculate_resume_score(candidate_id, db)
+                task.status = "done"
+                task.result = {
+                    "keywords": parsed_data.get("keywords"),
+                    "score": score_data.get("score"),
+                    "cached": parsed_data.get("cached")
+                }
+            except HTTPException as e:
+                db.rollback()
+                task.status = "failed"
+                task.error = str(e.detail)
+            except Exception as e:
+                db.rollback()
+                logger.exception("resume task %s failed", task_id)
+                task.status = "failed"
+                task.error = str(e)
+            db.commit()
+        finally:
+            db.close()
+            with self._in_flight_lock:
+                self._in_flight.discard(task_id)
+            self._slots.release()
+            self._wakeup.set()
+
+
+resume_worker = ResumeWorker()
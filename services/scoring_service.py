@@ -1,16 +1,338 @@
+from typing import List, NamedTuple, Optional
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, contains_eager, load_only
+import heapq
 import json
+import logging
+import threading
+import time
+import numpy as np
+import scipy.sparse as sp
+from config import settings
+from database import SessionLocal
 from model import models
+from services.semantic_index import semantic_index
+from services.tfidf_index import tfidf_index
+from utils.resume_features import FEATURES_VERSION, education_score, extract_features
 
-def score_candidate(candidate_id: int, db: Session):
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = {
+    "keywords": 0.45,
+    "tfidf": 0.20,
+    "semantic": 0.15,
+    "experience": 0.15,
+    "education": 0.05
+}
+DEFAULT_REQUIRED_YEARS = 3
+DEFAULT_REQUIRED_EDUCATION = "bachelor"
+
+
+
+def weights_from_config(config):
+    if config:
+        config_data = json.loads(config) if isinstance(config, str) else config
+        return config_data.get("weights", dict(DEFAULT_WEIGHTS))
+    return dict(DEFAULT_WEIGHTS)
+
+
+class ScoringConfigCache:
+    """
+    In-process copy of the current scoring weights.
+
+    The version is the id of the newest `scoring_config` row (0 for the built-in
+    defaults). `set_config` swaps the cache as soon as HR writes a new row; other
+    processes pick it up when their copy is older than SCORING_CONFIG_TTL_SECONDS.
+    """
+
+    def __init__(self, ttl: float = settings.SCORING_CONFIG_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = None
+        self._weights = None
+        self._loaded_at = 0.0
+
+    def _stale(self) -> bool:
+        return self._version is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def _store(self, version: int, weights: dict):
+        with self._lock:
+            self._version, self._weights = version, weights
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, db: Session):
+        config = db.query(models.ScoringConfig).order_by(models.ScoringConfig.updatedAt.desc(),
+                                                         models.ScoringConfig.id.desc()).first()
+        self._store(config.id if config else 0, weights_from_config(config.config if config else None))
+
+    def get(self, db: Session):
+        """Returns (version, weights); callers must not mutate the weights."""
+        if self._stale():
+            self.refresh(db)
+        with self._lock:
+            return self._version, self._weights
+
+    def set_config(self, config: models.ScoringConfig):
+        self._store(config.id, weights_from_config(config.config))
+
+    def invalidate(self):
+        with self._lock:
+            self._version = None
+
+
+scoring_config_cache = ScoringConfigCache()
+
+
+def load_weights(db: Session):
+    return scoring_config_cache.get(db)[1]
+
+
+def get_scoring_config(db: Session):
+    version, weights = scoring_config_cache.get(db)
+    config = db.get(models.ScoringConfig, version) if version else None
+    return {
+        "version": version,
+        "name": config.name if config else "default",
+        "weights": weights,
+        "updatedAt": config.updatedAt if config else None,
+    }
+
+
+def save_scoring_config(name: str, weights: dict, db: Session):
+    """
+    Store a new scoring config row and make it current. Returns
+    (config response, changed) where `changed` says whether the weights differ
+    from the ones in effect before.
+    """
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown weights: {sorted(unknown)}")
+    if any(w < 0 for w in weights.values()):
+        raise HTTPException(status_code=400, detail="Weights must be non-negative")
+    merged = {**DEFAULT_WEIGHTS, **weights}
+
+    _, previous = scoring_config_cache.get(db)
+    try:
+        config = models.ScoringConfig(name=name, config={"weights": merged})
+        db.add(config)
+        db.commit()
+        db.refresh(config)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to save scoring config: {e}")
+
+    scoring_config_cache.set_config(config)
+    return get_scoring_config(db), merged != previous
+
+
+def rescore_all_jobs(job_ids=None):
+    """
+    Re-score every job that has parsed resumes (or just `job_ids`) with the
+    current weights. Runs after the response, so it opens its own session.
+    """
+    db = SessionLocal()
+    try:
+        if job_ids is None:
+            job_ids = [
+                job_id for (job_id,) in
+                db.query(models.Candidate.jobId)
+                .join(models.ResumeParsed, models.ResumeParsed.candidateId == models.Candidate.id)
+                .distinct()
+                .all()
+            ]
+        rescored = 0
+        for job_id in job_ids:
+            try:
+                rescored += rescore_job(job_id, db)["rescored"]
+            except HTTPException as e:
+                logger.warning("Skipping re-score of job %s: %s", job_id, e.detail)
+        logger.info("Re-scored %d candidates across %d jobs", rescored, len(job_ids))
+        return rescored
+    finally:
+        db.close()
+
+
+def load_scoring_context(candidate_id: int, db: Session):
+    """
+    Candidate, its latest parsed resume and its job in one SELECT (job joined
+    eagerly, latest parse as a correlated subquery). Of the parse only the
+    columns scoring reads are loaded; `text` is fetched on access (e.g. by
+    ensure_features for an outdated row). Returns (candidate, parsed, job);
+    candidate is None when not found.
+    """
+    latest_parsed_id = (
+        select(func.max(models.ResumeParsed.id))
+        .where(models.ResumeParsed.candidateId == models.Candidate.id)
+        .correlate(models.Candidate)
+        .scalar_subquery()
+    )
+    row = (
+        db.query(models.Candidate, models.ResumeParsed)
+        .join(models.Candidate.job)
+        .outerjoin(models.ResumeParsed, models.ResumeParsed.id == latest_parsed_id)
+        .options(contains_eager(models.Candidate.job),
+                 load_only(models.ResumeParsed.id, models.ResumeParsed.candidateId, models.ResumeParsed.keywords,
+                           models.ResumeParsed.termCounts, models.ResumeParsed.experienceYears,
+                           models.ResumeParsed.educationLevel, models.ResumeParsed.featuresVersion))
+        .filter(models.Candidate.id == candidate_id)
+        .first()
+    )
+    if row is None:
+        return None, None, None
+    candidate, parsed = row
+    return candidate, parsed, candidate.job
+
+
+def ensure_features(parsed: models.ResumeParsed):
+    """
+    Backfill precomputed features on rows parsed before they existed (or by an
+    older extractor). The values are saved with the caller's next commit.
+    """
+    if parsed.featuresVersion != FEATURES_VERSION:
+        for column, value in extract_features(parsed.text).items():
+            setattr(parsed, column, value)
+    return parsed
+
+
+class TopKCache:
+    """
+    Per-job min-heap of the best TOPK_CACHE_SIZE (score, candidate) pairs.
+
+    Filled from `ORDER BY score DESC LIMIT n` on first use. Score writes update
+    the heap in place when that is provably exact (a new candidate entering the
+    top N) and drop the job's entry otherwise. Writes made by other processes
+    (other uvicorn workers) aren't seen, so entries are also refilled once
+    older than TOPK_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, size: int = settings.TOPK_CACHE_SIZE, enabled: bool = settings.TOPK_CACHE_ENABLED,
+                 ttl: float = settings.TOPK_CACHE_TTL_SECONDS):
+        self.size = size
+        self.enabled = enabled
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # job_id -> (heap of (score, -candidate_id), member ids, complete)
+        self._jobs = {}
+        self._filled_at = {}
+
+    def _entry(self, job_id: int):
+        # caller holds the lock
+        entry = self._jobs.get(job_id)
+        if entry is not None and time.monotonic() - self._filled_at[job_id] >= self.ttl:
+            del self._jobs[job_id], self._filled_at[job_id]
+            return None
+        return entry
+
+    def get(self, job_id: int, k: int):
+        if not self.enabled or k > self.size:
+            return None
+        with self._lock:
+            entry = self._entry(job_id)
+            if entry is None:
+                return None
+            heap, _, _ = entry
+            return [-neg_id for _, neg_id in heapq.nlargest(k, heap)]
+
+    def fill(self, job_id: int, rows):
+        if not self.enabled:
+            return
+        heap = [(score, -candidate_id) for candidate_id, score in rows]
+        heapq.heapify(heap)
+        with self._lock:
+            # fewer rows than the cache size means we hold every scored candidate
+            self._jobs[job_id] = (heap, {cid for cid, _ in rows}, len(rows) < self.size)
+            self._filled_at[job_id] = time.monotonic()
+
+    def record(self, job_id: int, candidate_id: int, score: float):
+        with self._lock:
+            entry = self._entry(job_id)
+            if entry is None:
+                return
+            heap, members, complete = entry
+            if candidate_id in members:
+                # its old score may have been holding a slot we can't refill
+                del self._jobs[job_id]
+            elif len(heap) < self.size:
+                if complete:
+                    heapq.heappush(heap, (score, -candidate_id))
+                    members.add(candidate_id)
+                else:
+                    del self._jobs[job_id]
+            elif (score, -candidate_id) > heap[0]:
+                _, evicted = heapq.heappushpop(heap, (score, -candidate_id))
+                members.discard(-evicted)
+                members.add(candidate_id)
+                self._jobs[job_id] = (heap, members, False)
 
+    def invalidate(self, job_id: Optional[int] = None):
+        with self._lock:
+            if job_id is None:
+                self._jobs.clear()
+                self._filled_at.clear()
+            else:
+                self._jobs.pop(job_id, None)
+                self._filled_at.pop(job_id, None)
+
+
+topk_cache = TopKCache()
+
+
+def top_candidates(job_id: int, k: int, db: Session):
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    ids = topk_cache.get(job_id, k)
+    if ids is None:
+        # served by ix_candidates_job_score
+        n = max(k, topk_cache.size) if topk_cache.enabled else k
+        rows = (
+            db.query(models.Candidate.id, models.Candidate.score)
+            .filter(models.Candidate.jobId == job_id, models.Candidate.score.isnot(None))
+            .order_by(models.Candidate.score.desc(), models.Candidate.id.asc())
+            .limit(n)
+            .all()
+        )
+        if n == topk_cache.size:
+            topk_cache.fill(job_id, rows)
+        ids = [cid for cid, _ in rows[:k]]
+
+    if not ids:
+        return []
+    candidates = db.query(models.Candidate).filter(models.Candidate.id.in_(ids)).all()
+    by_id = {c.id: c for c in candidates}
+    return [by_id[cid] for cid in ids if cid in by_id]
+
+
+def job_matches(candidate_id: int, k: int, db: Session):
+    """
+    The k jobs whose LSA embedding is closest to the candidate's latest resume:
+    one projection and one dot product against every job embedding.
+    """
+    candidate, parsed, _ = load_scoring_context(candidate_id, db)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
+    if not parsed:
+        raise HTTPException(status_code=400, detail="Missing parsed resume")
+
+    job_ids, scores = semantic_index.job_scores(db, ensure_features(parsed).termCounts)
+    if not len(job_ids):
+        return []
+    top = np.argsort(-scores, kind="stable")[:k]
+    titles = dict(db.query(models.Job.id, models.Job.title)
+                  .filter(models.Job.id.in_([int(job_ids[i]) for i in top])).all())
+    return [
+        {"jobId": int(job_ids[i]), "title": titles[int(job_ids[i])], "similarity": round(float(scores[i]), 4)}
+        for i in top if int(job_ids[i]) in titles
+    ]
+
 
-    parsed = candidate.parsedResume
-    job = candidate.job
+def score_candidate(candidate_id: int, db: Session):
+    candidate, parsed, job = load_scoring_context(candidate_id, db)
+
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
 
     if not parsed or not job:
         raise HTTPException(status_code=400, detail="Missing parsed resume or job data")
@@ -31,10 +353,186 @@ def score_candidate(candidate_id: int, db: Session):
     }
     candidate.status = "screened"
 
+    job_id = candidate.jobId
     db.commit()
-    db.refresh(candidate)
+    # no refresh: every value we need is already in hand
+    topk_cache.record(job_id, candidate_id, score)
     return {
         "candidateId": candidate_id,
         "score": score,
         "matchedKeywords": matched
     }
+
+
+class BatchScores(NamedTuple):
+    """Per-resume component scores from score_batch, aligned with its input order."""
+    keyword: np.ndarray
+    tfidf: np.ndarray
+    semantic: np.ndarray
+    experience: np.ndarray
+    experience_years: np.ndarray
+    education: np.ndarray
+    education_levels: List[Optional[str]]
+    final: np.ndarray
+    matched_keywords: List[List[str]]
+
+    def breakdown(self, i: int, weights: dict, config_version: int):
+        return {
+            "keyword_score": round(float(self.keyword[i]), 2),
+            "tfidf_similarity": round(float(self.tfidf[i]), 2),
+            "semantic_similarity": round(float(self.semantic[i]), 2),
+            "experience_score": round(float(self.experience[i]), 2),
+            "education_score": round(float(self.education[i]), 2),
+            "weights": weights,
+            "weights_version": config_version,
+            "matched_keywords": self.matched_keywords[i],
+            "experience_years": float(self.experience_years[i]),
+            "education_level": self.education_levels[i],
+            "final_score": float(self.final[i])
+        }
+
+
+def backfill_features(entries: dict, db: Session):
+    """
+    `entries` maps any key to [parsed_id, keywords, termCounts, experienceYears,
+    educationLevel, featuresVersion]. Rows parsed before features were
+    precomputed are extracted once, updated in place and stored (saved with
+    the caller's commit).
+    """
+    stale = {entry[0]: entry for entry in entries.values() if entry[5] != FEATURES_VERSION}
+    if not stale:
+        return
+    backfill = []
+    texts = db.query(models.ResumeParsed.id, models.ResumeParsed.text).filter(
+        models.ResumeParsed.id.in_(list(stale))
+    ).all()
+    for parsed_id, text in texts:
+        features = extract_features(text or "")
+        backfill.append({"id": parsed_id, **features})
+        stale[parsed_id][2:6] = (features["termCounts"], features["experienceYears"], features["educationLevel"],
+                                 FEATURES_VERSION)
+    db.execute(update(models.ResumeParsed), backfill)
+
+
+def score_batch(job: models.Job, keywords_list, term_counts_list, years_list, education_list, weights: dict,
+                db: Session) -> BatchScores:
+    """
+    Score many resumes against one job from their precomputed features:
+    keyword and TF-IDF scores as sparse matrix products, semantic similarity
+    as one projection and dot product.
+    """
+    n = len(term_counts_list)
+
+    # ========== 1️⃣ Keyword Matching (resume x job-keyword matrix) ==========
+    job_keywords = [kw.lower() for kw in (job.scoringKeywords or [])]
+    columns = {kw: i for i, kw in enumerate(dict.fromkeys(job_keywords))}
+    indptr, indices = [0], []
+    for keywords in keywords_list:
+        hits = {columns[kw.lower()] for kw in keywords or [] if kw.lower() in columns}
+        indices.extend(sorted(hits))
+        indptr.append(len(indices))
+    keyword_matrix = sp.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(n, max(len(columns), 1))
+    )
+    matched_counts = np.asarray(keyword_matrix.sum(axis=1)).ravel()
+    keyword_scores = np.minimum(1, matched_counts / len(job_keywords)) if job_keywords else np.zeros(n)
+
+    # ========== 2️⃣ TF-IDF Similarity (one transform for all resumes) ==========
+    tfidf_index.ensure_fitted(db)
+    vectorizer, job_vectors = tfidf_index.snapshot()
+    if vectorizer is not None:
+        resume_matrix = tfidf_index.vectors_from_counts(vectorizer, term_counts_list)
+        job_vec = tfidf_index.job_vector(job, vectorizer, job_vectors)
+        tfidf_scores = np.asarray((resume_matrix @ job_vec.T).todense()).ravel()
+    else:
+        tfidf_scores = np.zeros(n)
+
+    # ========== 3️⃣ Latent Semantic Similarity (one projection for all resumes) ==========
+    semantic_scores = semantic_index.similarities(db, job, term_counts_list)
+
+    # ========== 4️⃣ Experience and education ==========
+    experience_years = np.array([years or 0 for years in years_list], dtype=np.float64)
+    required_years = getattr(job, "requiredExperience", DEFAULT_REQUIRED_YEARS)
+    experience_scores = np.clip((experience_years - required_years) / 5, 0, 1)
+    required_education = getattr(job, "requiredEducation", DEFAULT_REQUIRED_EDUCATION)
+    education_scores = np.array([education_score(level, required_education) for level in education_list])
+
+    # ========== 5️⃣ Final Weighted Score ==========
+    final_scores = np.round(
+        (weights["keywords"] * keyword_scores +
+         weights["tfidf"] * tfidf_scores +
+         weights.get("semantic", 0) * semantic_scores +
+         weights["experience"] * experience_scores +
+         weights.get("education", 0) * education_scores) * 100, 2
+    )
+
+    column_names = list(columns.keys())
+    matched = [[column_names[j] for j in keyword_matrix.indices[keyword_matrix.indptr[i]:keyword_matrix.indptr[i + 1]]]
+               for i in range(n)]
+    return BatchScores(keyword_scores, tfidf_scores, semantic_scores, experience_scores, experience_years,
+                       education_scores, list(education_list), final_scores, matched)
+
+
+def rescore_job(job_id: int, db: Session):
+    """
+    Re-score every candidate of a job in one vectorized pass.
+
+    Parsed resumes are loaded with a single query, scored together by
+    score_batch and the results are written back with one bulk UPDATE.
+    """
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job or not job.description:
+        raise HTTPException(status_code=404, detail="Job description not found")
+
+    config_version, weights = scoring_config_cache.get(db)
+
+    rows = (
+        db.query(models.ResumeParsed.id, models.ResumeParsed.candidateId, models.ResumeParsed.keywords,
+                 models.ResumeParsed.termCounts, models.ResumeParsed.experienceYears,
+                 models.ResumeParsed.educationLevel, models.ResumeParsed.featuresVersion)
+        .join(models.Candidate, models.Candidate.id == models.ResumeParsed.candidateId)
+        .filter(models.Candidate.jobId == job_id)
+        .order_by(models.ResumeParsed.id)
+        .all()
+    )
+    # latest parse wins when a candidate uploaded more than once
+    latest = {}
+    for parsed_id, candidate_id, keywords, term_counts, years, education, version in rows:
+        latest[candidate_id] = [parsed_id, keywords or [], term_counts, years, education, version]
+
+    # rows parsed before features were precomputed: extract once and store them
+    backfill_features(latest, db)
+
+    latest = {cid: entry for cid, entry in latest.items() if entry[2]}
+    if not latest:
+        db.commit()
+        return {"message": "No parsed resumes to score", "job_id": job_id, "rescored": 0, "ranking": []}
+
+    candidate_ids = list(latest.keys())
+    n = len(candidate_ids)
+    entries = [latest[cid] for cid in candidate_ids]
+    scores = score_batch(job, [e[1] for e in entries], [e[2] for e in entries], [e[3] for e in entries],
+                         [e[4] for e in entries], weights, db)
+    final_scores = scores.final
+
+    # ========== Bulk Save ==========
+    updates = [
+        {"id": cid, "score": float(final_scores[i]), "scoreBreakdown": scores.breakdown(i, weights, config_version)}
+        for i, cid in enumerate(candidate_ids)
+    ]
+
+    try:
+        db.execute(update(models.Candidate), updates)
+        db.commit()
+        topk_cache.invalidate(job_id)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to save scores: {e}")
+
+    order = np.argsort(-final_scores, kind="stable")
+    return {
+        "message": "Candidates re-scored successfully",
+        "job_id": job_id,
+        "rescored": n,
+        "ranking": [{"candidate_id": candidate_ids[i], "score": float(final_scores[i])} for i in order]
+    }
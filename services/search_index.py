@@ -0,0 +1,165 @@
+# services/search_index.py
+import logging
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from config import settings
+from model import models
+from utils.search_query import parse_query, to_fts5
+
+logger = logging.getLogger(__name__)
+
+START_SEL, STOP_SEL = "<mark>", "</mark>"
+
+# only the latest parse of each candidate is searchable
+_LATEST_PARSE = 'rp.id = (SELECT max(r2.id) FROM resume_parsed r2 WHERE r2."candidateId" = rp."candidateId")'
+_JOB_FILTER = 'AND EXISTS (SELECT 1 FROM candidates c WHERE c.id = rp."candidateId" AND c."jobId" = :job_id)'
+
+_PG_SEARCH = f"""
+WITH query AS (SELECT websearch_to_tsquery(CAST(:config AS regconfig), :q) AS q),
+hits AS (
+    -- normalization 1|32: divide by 1 + log(length), scale to rank / (rank + 1)
+    SELECT rp.id, rp."candidateId" AS candidate_id, ts_rank_cd(rp.search_vector, query.q, 33) AS rank,
+           count(*) OVER () AS total
+    FROM resume_parsed rp, query
+    WHERE rp.search_vector @@ query.q AND {_LATEST_PARSE} {{job_filter}}
+    ORDER BY rank DESC, rp.id
+    LIMIT :limit OFFSET :offset
+)
+SELECT hits.id, hits.candidate_id, hits.rank, hits.total,
+       ts_headline(CAST(:config AS regconfig), rp.text, query.q, :headline) AS snippet
+FROM hits JOIN resume_parsed rp ON rp.id = hits.id, query
+ORDER BY hits.rank DESC, hits.id
+"""
+
+# FTS5 auxiliary functions can't run under a window function; rank in a materialized CTE first
+_SQLITE_SEARCH = f"""
+WITH matches AS MATERIALIZED (
+    SELECT rowid AS id, bm25(resume_search) AS score FROM resume_search WHERE resume_search MATCH :q
+)
+SELECT rp.id, rp."candidateId" AS candidate_id, -matches.score AS rank, count(*) OVER () AS total
+FROM matches JOIN resume_parsed rp ON rp.id = matches.id
+WHERE {_LATEST_PARSE} {{job_filter}}
+ORDER BY rank DESC, rp.id
+LIMIT :limit OFFSET :offset
+"""
+
+_SQLITE_SNIPPETS = """
+SELECT rowid AS id, snippet(resume_search, 0, :start, :stop, '…', 24) AS snippet
+FROM resume_search WHERE resume_search MATCH :q AND rowid IN ({ids})
+"""
+
+
+class ResumeSearchIndex:
+    """
+    Full-text index over parsed resume text.
+
+    Postgres: a `search_vector tsvector` column on resume_parsed with a GIN index,
+    queried with websearch_to_tsquery and ranked by ts_rank_cd with length
+    normalisation. SQLite: an external-content FTS5 table (porter stemming) over
+    resume_parsed.text, ranked by bm25(). Both are written by parse_resume in
+    the same transaction as the parsed row.
+    """
+
+    def __init__(self, language: str = settings.SEARCH_LANGUAGE):
+        self.language = language
+
+    @staticmethod
+    def _dialect(bind) -> str:
+        return bind.dialect.name
+
+    # ---------- schema ----------
+    def ensure_schema(self, engine):
+        """Create the index if missing and backfill rows parsed before it existed. Run at startup."""
+        dialect = self._dialect(engine)
+        with engine.begin() as conn:
+            if dialect == "postgresql":
+                conn.execute(text("ALTER TABLE resume_parsed ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_resume_parsed_search "
+                                  "ON resume_parsed USING GIN (search_vector)"))
+                backfilled = conn.execute(text(
+                    "UPDATE resume_parsed SET search_vector = to_tsvector(CAST(:config AS regconfig), text) "
+                    "WHERE search_vector IS NULL"), {"config": self.language}).rowcount
+            elif dialect == "sqlite":
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resume_search'")).first()
+                if exists:
+                    return
+                conn.execute(text("CREATE VIRTUAL TABLE resume_search USING fts5("
+                                  "text, content='resume_parsed', content_rowid='id', tokenize='porter unicode61')"))
+                conn.execute(text("INSERT INTO resume_search(resume_search) VALUES ('rebuild')"))
+                backfilled = conn.execute(text("SELECT count(*) FROM resume_parsed")).scalar()
+            else:
+                logger.warning("Resume search is not available on %s", dialect)
+                return
+        if backfilled:
+            logger.info("🔎 Indexed %d parsed resumes for search", backfilled)
+
+    # ---------- writes ----------
+    def index(self, parsed: models.ResumeParsed, db: Session):
+        """Index a flushed ResumeParsed row; committed with the caller's transaction."""
+        dialect = self._dialect(db.get_bind())
+        if dialect == "postgresql":
+            db.execute(text("UPDATE resume_parsed SET search_vector = to_tsvector(CAST(:config AS regconfig), text) "
+                            "WHERE id = :id"), {"config": self.language, "id": parsed.id})
+        elif dialect == "sqlite":
+            db.execute(text("INSERT INTO resume_search(rowid, text) VALUES (:id, :text)"),
+                       {"id": parsed.id, "text": parsed.text})
+
+    # ---------- queries ----------
+    def search(self, db: Session, q: str, limit: int = 20, offset: int = 0, job_id: Optional[int] = None):
+        """
+        Candidates whose latest parsed resume matches `q` (see utils/search_query.py
+        for the syntax), best match first, with a highlighted snippet each.
+        """
+        required, _ = parse_query(q)
+        if not required:
+            raise HTTPException(status_code=400, detail="Search query needs at least one term to match")
+
+        dialect = self._dialect(db.get_bind())
+        params = {"limit": limit, "offset": offset, "job_id": job_id}
+        job_filter = _JOB_FILTER if job_id is not None else ""
+        if dialect == "postgresql":
+            sql = _PG_SEARCH.format(job_filter=job_filter)
+            params.update(q=q, config=self.language,
+                          headline=f'StartSel={START_SEL}, StopSel={STOP_SEL}, MaxFragments=2, '
+                                   f'MaxWords=24, MinWords=8, FragmentDelimiter=" … "')
+        elif dialect == "sqlite":
+            sql = _SQLITE_SEARCH.format(job_filter=job_filter)
+            params.update(q=to_fts5(q), start=START_SEL, stop=STOP_SEL)
+        else:
+            raise HTTPException(status_code=501, detail=f"Resume search is not available on {dialect}")
+
+        try:
+            rows = db.execute(text(sql), params).all()
+        except OperationalError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid search query: {e.orig}")
+
+        if dialect == "postgresql":
+            snippets = {row.id: row.snippet for row in rows}
+        elif rows:
+            # only for the page; snippet() re-reads the matched document
+            ids = ", ".join(str(int(row.id)) for row in rows)
+            snippets = dict(db.execute(text(_SQLITE_SNIPPETS.format(ids=ids)), params).all())
+        else:
+            snippets = {}
+
+        # past the last page the total is unknown without another query
+        total = rows[0].total if rows else (0 if offset == 0 else None)
+        candidates = {}
+        if rows:
+            ids = [row.candidate_id for row in rows]
+            candidates = {c.id: c for c in db.query(models.Candidate).filter(models.Candidate.id.in_(ids)).all()}
+        items = [
+            {"candidate": candidates[row.candidate_id], "rank": round(float(row.rank), 4), "snippet": snippets.get(row.id)}
+            for row in rows if row.candidate_id in candidates
+        ]
+        next_offset = offset + limit if total and offset + limit < total else None
+        return {"items": items, "total": total, "nextOffset": next_offset}
+
+
+resume_search_index = ResumeSearchIndex()
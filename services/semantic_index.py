@@ -0,0 +1,143 @@
+# services/semantic_index.py
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sqlalchemy.orm import Session
+
+from config import settings
+from model import models
+from services.tfidf_index import tfidf_index
+
+
+def _normalize(rows: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (rows / norms).astype(np.float32, copy=False)
+
+
+class SemanticIndex:
+    """
+    Latent semantic (LSA) similarity between resumes and jobs.
+
+    Refitted whenever the TF-IDF index refits: a TruncatedSVD over the same
+    corpus matrix maps TF-IDF vectors into SEMANTIC_DIMENSIONS latent dimensions,
+    where terms that appear in the same contexts ("postgres" / "postgresql",
+    "ml" / "machine learning") land close together. Every job is embedded once
+    into a dense, l2-normalised float32 matrix, so scoring a resume is one
+    projection plus one matrix-vector product against all jobs. As with the
+    TF-IDF job vectors, a job whose description changed is re-embedded on its
+    next use.
+    """
+
+    def __init__(self, dimensions: int = settings.SEMANTIC_DIMENSIONS, enabled: bool = settings.SEMANTIC_ENABLED):
+        self.dimensions = dimensions
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.vectorizer = None  # the TF-IDF fit this index was built from
+        self.svd: Optional[TruncatedSVD] = None
+        self.job_ids = np.empty(0, dtype=np.int64)
+        self.job_matrix = np.empty((0, 0), dtype=np.float32)
+        # job id -> (description it was embedded from, row in job_matrix)
+        self._rows: Dict[int, Tuple[str, int]] = {}
+        tfidf_index.on_fit(self._refit)
+
+    # ---------- fitting ----------
+    def _refit(self, vectorizer, corpus_matrix, jobs: List[Tuple[int, str]]):
+        if not self.enabled:
+            return
+        k = min(self.dimensions, corpus_matrix.shape[0] - 1, corpus_matrix.shape[1] - 1)
+        svd, job_matrix = None, np.empty((0, 0), dtype=np.float32)
+        if k >= 2:
+            svd = TruncatedSVD(n_components=k, random_state=0).fit(corpus_matrix)
+            job_matrix = _normalize(svd.transform(corpus_matrix[:len(jobs)]))
+        with self._lock:
+            # too small a corpus leaves svd None: similarity is 0 until the next refit
+            self.vectorizer = vectorizer
+            self.svd = svd
+            self.job_ids = np.asarray([job_id for job_id, _ in jobs], dtype=np.int64)
+            self.job_matrix = job_matrix
+            self._rows = {job_id: (description, i) for i, (job_id, description) in enumerate(jobs)}
+
+    def ensure_fitted(self, db: Session):
+        tfidf_index.ensure_fitted(db)
+        vectorizer, _ = tfidf_index.snapshot()
+        if self.enabled and vectorizer is not None and vectorizer is not self.vectorizer:
+            # the TF-IDF index was fitted before we were listening
+            tfidf_index.fit(db, stale=vectorizer)
+
+    def snapshot(self):
+        with self._lock:
+            return self.vectorizer, self.svd, self.job_ids, self.job_matrix, self._rows
+
+    # ---------- embeddings ----------
+    def embed_counts(self, term_counts_list, vectorizer=None, svd=None) -> Optional[np.ndarray]:
+        """(n, k) float32 embeddings of resumes from their stored term counts."""
+        if svd is None:
+            vectorizer, svd, *_ = self.snapshot()
+        if svd is None:
+            return None
+        return _normalize(svd.transform(tfidf_index.vectors_from_counts(vectorizer, term_counts_list)))
+
+    def add_job(self, job: models.Job):
+        """Called from create_job (and on use after an edit): embed the job with the current fit."""
+        description = job.description or ""
+        with self._lock:
+            if self.svd is None:
+                return
+            current = self._rows.get(job.id)
+            if current is not None and current[0] == description:
+                return
+            row = _normalize(self.svd.transform(self.vectorizer.transform([description])))
+            # copy-on-write, so snapshots taken by concurrent scorers stay consistent
+            if current is not None:
+                index = current[1]
+                job_matrix = self.job_matrix.copy()
+                job_matrix[index] = row[0]
+                self.job_matrix = job_matrix
+            else:
+                index = len(self.job_ids)
+                self.job_ids = np.append(self.job_ids, job.id)
+                self.job_matrix = np.vstack([self.job_matrix, row]) if len(self.job_matrix) else row
+            self._rows = {**self._rows, job.id: (description, index)}
+
+    def job_embedding(self, job: models.Job) -> Optional[np.ndarray]:
+        _, svd, _, job_matrix, rows = self.snapshot()
+        if svd is None:
+            return None
+        cached = rows.get(job.id)
+        if cached is None or cached[0] != (job.description or ""):
+            # created in another process since our last fit, or edited since it was embedded
+            self.add_job(job)
+            _, _, _, job_matrix, rows = self.snapshot()
+            cached = rows.get(job.id)
+            if cached is None:
+                return None  # a concurrent refit found too small a corpus
+        return job_matrix[cached[1]]
+
+    # ---------- scoring ----------
+    def job_scores(self, db: Session, term_counts: dict):
+        """Similarity of one resume to every job: (job_ids, float32 similarities in [0, 1])."""
+        self.ensure_fitted(db)
+        vectorizer, svd, job_ids, job_matrix, _ = self.snapshot()
+        if svd is None or not len(job_ids):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        resume = self.embed_counts([term_counts], vectorizer, svd)[0]
+        return job_ids, np.clip(job_matrix @ resume, 0, 1)
+
+    def similarity(self, db: Session, job: models.Job, term_counts: dict) -> float:
+        """Similarity of one resume to one job: a projection and a single dot product."""
+        return float(self.similarities(db, job, [term_counts])[0])
+
+    def similarities(self, db: Session, job: models.Job, term_counts_list) -> np.ndarray:
+        """Similarity of many resumes to one job (rescore_job)."""
+        self.ensure_fitted(db)
+        vectorizer, svd, *_ = self.snapshot()
+        job_vec = self.job_embedding(job)
+        if svd is None or job_vec is None:
+            return np.zeros(len(term_counts_list), dtype=np.float32)
+        return np.clip(self.embed_counts(term_counts_list, vectorizer, svd) @ job_vec, 0, 1)
+
+
+semantic_index = SemanticIndex()
@@ -0,0 +1,271 @@
+# services/skill_index.py
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from config import settings
+from model import models
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill(name: str) -> str:
+    return (name or "").strip().lower()
+
+
+class _JobBitmaps:
+    """Packed skill bitmaps over one job's candidates; bit i is candidate_ids[i]."""
+
+    __slots__ = ("candidate_ids", "bits", "built_at")
+
+    def __init__(self, candidate_ids: np.ndarray, bits: Dict[int, np.ndarray]):
+        self.candidate_ids = candidate_ids  # sorted
+        self.bits = bits
+        self.built_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.candidate_ids)
+
+    def row(self, candidate_id: int) -> Optional[int]:
+        i = int(np.searchsorted(self.candidate_ids, candidate_id))
+        return i if i < self.size and self.candidate_ids[i] == candidate_id else None
+
+
+class SkillIndex:
+    """
+    Skills interned to integer ids, with an in-memory bitmap index per job.
+
+    candidate_skills is the normalized source of truth, written by parse_resume.
+    For each job queried, one SELECT loads (candidate, skill) pairs into a
+    NumPy packed-bit array per skill, so AND / OR / NOT filters are bitwise
+    ops over n/8 bytes and keyword-match counts are a sum of unpacked rows.
+    Parses update the bitmaps in place; new candidates drop the job's entry,
+    and entries expire after SKILL_INDEX_TTL_SECONDS to pick up writes made
+    by other processes.
+    """
+
+    def __init__(self, ttl: float = settings.SKILL_INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._skill_ids: Dict[str, int] = {}  # skills are never deleted
+        self._jobs: Dict[int, _JobBitmaps] = {}
+
+    # ---------- interning ----------
+    def skill_ids(self, names: Iterable[str], db: Session, create: bool = False) -> Dict[str, int]:
+        """name -> id for the given skills; unknown names are inserted when `create`, else left out."""
+        names = {normalize_skill(n) for n in names} - {""}
+        missing = names - self._skill_ids.keys()
+        if missing and create:
+            dialect = db.get_bind().dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+                db.execute(insert(models.Skill).on_conflict_do_nothing(index_elements=[models.Skill.name]),
+                           [{"name": n} for n in sorted(missing)])
+            else:
+                known = set(db.scalars(select(models.Skill.name).where(models.Skill.name.in_(missing))))
+                db.add_all(models.Skill(name=n) for n in sorted(missing - known))
+                db.flush()
+        found = {n: self._skill_ids[n] for n in names - missing}
+        if missing:
+            rows = db.query(models.Skill.name, models.Skill.id).filter(models.Skill.name.in_(missing)).all()
+            found.update(rows)
+            if not create:
+                # ids inserted by this transaction are cached only once committed (see record)
+                self._remember(rows)
+        return found
+
+    def _remember(self, skills):
+        with self._lock:
+            self._skill_ids.update(skills)
+
+    def sync_candidate(self, candidate_id: int, keywords: Iterable[str], db: Session) -> Dict[str, int]:
+        """Replace a candidate's skill rows; committed by the caller, then pass the result to record()."""
+        skills = self.skill_ids(keywords, db, create=True)
+        db.execute(delete(models.CandidateSkill).where(models.CandidateSkill.candidateId == candidate_id))
+        if skills:
+            self._insert_pairs([(candidate_id, skill_id) for skill_id in sorted(set(skills.values()))], db)
+        return skills
+
+    @staticmethod
+    def _insert_pairs(pairs, db: Session):
+        """Insert (candidate id, skill id) rows, skipping any a concurrent parse already wrote."""
+        values = [{"candidateId": cid, "skillId": sid} for cid, sid in pairs]
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            db.execute(insert(models.CandidateSkill).on_conflict_do_nothing(), values)
+        else:
+            db.execute(models.CandidateSkill.__table__.insert(), values)
+
+    def backfill(self, db: Session, batch_size: int = 1000) -> int:
+        """Fill candidate_skills for candidates parsed before it existed. Run at startup."""
+        latest_parsed_id = (
+            select(func.max(models.ResumeParsed.id))
+            .where(models.ResumeParsed.candidateId == models.Candidate.id)
+            .correlate(models.Candidate)
+            .scalar_subquery()
+        )
+        has_skills = select(models.CandidateSkill.candidateId).where(
+            models.CandidateSkill.candidateId == models.Candidate.id).exists()
+        rows = (
+            db.query(models.Candidate.id, models.ResumeParsed.keywords)
+            .join(models.ResumeParsed, models.ResumeParsed.id == latest_parsed_id)
+            .filter(~has_skills)
+            .all()
+        )
+        # candidates without keywords have no rows to add and are selected again on every run
+        rows = [(cid, keywords) for cid, keywords in rows if keywords]
+        filled = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            ids = self.skill_ids((kw for _, keywords in batch for kw in keywords), db, create=True)
+            pairs = {(cid, ids[normalize_skill(kw)]) for cid, keywords in batch for kw in keywords
+                     if normalize_skill(kw) in ids}
+            if pairs:
+                self._insert_pairs(sorted(pairs), db)
+                filled += len({cid for cid, _ in pairs})
+            db.commit()
+            self._remember(ids.items())
+        if filled:
+            logger.info("🧩 Indexed skills for %d parsed candidates", filled)
+            self.invalidate()
+        return filled
+
+    # ---------- bitmaps ----------
+    def _build(self, job_id: int, db: Session) -> _JobBitmaps:
+        rows = (
+            db.query(models.Candidate.id, models.CandidateSkill.skillId)
+            .outerjoin(models.CandidateSkill, models.CandidateSkill.candidateId == models.Candidate.id)
+            .filter(models.Candidate.jobId == job_id)
+            .all()
+        )
+        candidate_ids = np.unique(np.fromiter((cid for cid, _ in rows), dtype=np.int64, count=len(rows)))
+        pairs = np.array([(cid, sid) for cid, sid in rows if sid is not None], dtype=np.int64).reshape(-1, 2)
+        bits = {}
+        if len(pairs):
+            pairs = pairs[np.argsort(pairs[:, 1], kind="stable")]
+            skills, starts = np.unique(pairs[:, 1], return_index=True)
+            positions = np.searchsorted(candidate_ids, pairs[:, 0])
+            for skill_id, members in zip(skills, np.split(positions, starts[1:])):
+                row = np.zeros(len(candidate_ids), dtype=bool)
+                row[members] = True
+                bits[int(skill_id)] = np.packbits(row)
+        return _JobBitmaps(candidate_ids, bits)
+
+    def _entry(self, job_id: int, db: Session) -> _JobBitmaps:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        if entry is None or time.monotonic() - entry.built_at > self.ttl:
+            entry = self._build(job_id, db)
+            with self._lock:
+                self._jobs[job_id] = entry
+        return entry
+
+    def record(self, job_id: int, candidate_id: int, skills: Dict[str, int]):
+        """A candidate's skills (name -> id, from sync_candidate) were committed: flip its bits in place."""
+        self._remember(skills.items())
+        skill_ids = set(skills.values())
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return
+            row = entry.row(candidate_id)
+            if row is None:
+                # new candidate: can't grow the bitmaps in place
+                del self._jobs[job_id]
+                return
+            byte, mask = row // 8, np.uint8(0x80 >> (row % 8))
+            for bitmap in entry.bits.values():
+                bitmap[byte] &= ~mask
+            for skill_id in skill_ids:
+                bitmap = entry.bits.get(skill_id)
+                if bitmap is None:
+                    bitmap = entry.bits[skill_id] = np.zeros((entry.size + 7) // 8, dtype=np.uint8)
+                bitmap[byte] |= mask
+
+    def invalidate(self, job_id: Optional[int] = None):
+        with self._lock:
+            if job_id is None:
+                self._jobs.clear()
+            else:
+                self._jobs.pop(job_id, None)
+
+    def match(self, job_id: int, db: Session, all_of: Iterable[int] = (), any_of: Iterable[int] = (),
+              none_of: Iterable[int] = ()) -> np.ndarray:
+        """Candidate ids of a job having every skill in all_of, one of any_of (if given) and none of none_of."""
+        entry = self._entry(job_id, db)
+        empty = np.zeros((entry.size + 7) // 8, dtype=np.uint8)
+        with self._lock:
+            mask = np.full_like(empty, 0xFF)
+            for skill_id in all_of:
+                mask &= entry.bits.get(skill_id, empty)
+            any_of = list(any_of)
+            if any_of:
+                either = empty.copy()
+                for skill_id in any_of:
+                    either |= entry.bits.get(skill_id, empty)
+                mask &= either
+            for skill_id in none_of:
+                mask &= ~entry.bits.get(skill_id, empty)
+            rows = np.flatnonzero(np.unpackbits(mask, count=entry.size))
+            return entry.candidate_ids[rows]
+
+    def match_counts(self, job_id: int, db: Session, skill_ids: Iterable[int], candidate_ids=None) -> np.ndarray:
+        """How many of skill_ids each candidate has (all of the job's candidates, or candidate_ids in that order)."""
+        entry = self._entry(job_id, db)
+        with self._lock:
+            counts = np.zeros(entry.size, dtype=np.int32)
+            for skill_id in set(skill_ids):
+                bitmap = entry.bits.get(skill_id)
+                if bitmap is not None:
+                    counts += np.unpackbits(bitmap, count=entry.size)
+            if candidate_ids is None:
+                return counts
+            return counts[np.searchsorted(entry.candidate_ids, candidate_ids)]
+
+
+skill_index = SkillIndex()
+
+
+def filter_candidates(job_id: int, db: Session, all_of: List[str] = (), any_of: List[str] = (),
+                      none_of: List[str] = (), limit: int = 50, offset: int = 0):
+    """
+    Candidates of a job matching a boolean skill filter, ordered by how many of
+    the job's scoring keywords they have.
+    """
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job_keywords = job.scoringKeywords or []
+    ids = skill_index.skill_ids([*all_of, *any_of, *none_of, *job_keywords], db)
+    page = {"items": [], "total": 0, "nextOffset": None}
+    if any(normalize_skill(n) not in ids for n in all_of):
+        return page  # nobody has a skill we have never seen
+    if any_of and not any(normalize_skill(n) in ids for n in any_of):
+        return page
+
+    def lookup(names):
+        return [ids[normalize_skill(n)] for n in names if normalize_skill(n) in ids]
+
+    matched = skill_index.match(job_id, db, lookup(all_of), lookup(any_of), lookup(none_of))
+    counts = skill_index.match_counts(job_id, db, lookup(job_keywords), matched)
+    order = np.lexsort((matched, -counts))[offset:offset + limit]
+    page_ids = [int(matched[i]) for i in order]
+    by_id = {c.id: c for c in db.query(models.Candidate).filter(models.Candidate.id.in_(page_ids)).all()} \
+        if page_ids else {}
+
+    total = len(matched)
+    page["items"] = [{"candidate": by_id[int(matched[i])], "matchedCount": int(counts[i])}
+                     for i in order if int(matched[i]) in by_id]
+    page["total"] = total
+    page["nextOffset"] = offset + limit if offset + limit < total else None
+    return page
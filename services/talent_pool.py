@@ -0,0 +1,118 @@
+# services/talent_pool.py
+import logging
+import time
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, contains_eager
+
+from config import settings
+from database import SessionLocal
+from model import models
+from services.scoring_service import backfill_features, score_batch, scoring_config_cache
+
+logger = logging.getLogger(__name__)
+
+
+def match_talent_pool(job_id: int, db: Session, top_n: int = settings.TALENT_POOL_SUGGESTIONS,
+                      chunk_size: int = settings.TALENT_POOL_CHUNK_SIZE):
+    """
+    Score every past applicant (latest parse of each candidate of other jobs)
+    against a job and store the best `top_n` as its talent suggestions.
+
+    The pool is read in keyset chunks of `chunk_size` resumes; each chunk is
+    scored in one vectorized pass (score_batch) and only its best `top_n` are
+    kept, so memory is bounded by the chunk size, not the pool size. Features
+    backfilled for a chunk are committed before the next one is read.
+    """
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job or not job.description:
+        raise HTTPException(status_code=404, detail="Job description not found")
+
+    config_version, weights = scoring_config_cache.get(db)
+    latest_parsed_id = (
+        select(func.max(models.ResumeParsed.id))
+        .where(models.ResumeParsed.candidateId == models.Candidate.id)
+        .correlate(models.Candidate)
+        .scalar_subquery()
+    )
+
+    best = []  # (score, candidate_id, breakdown), at most top_n
+    scanned, last_id = 0, 0
+    started = time.perf_counter()
+    while top_n > 0:
+        rows = (
+            db.query(models.Candidate.id, models.ResumeParsed.id, models.ResumeParsed.keywords,
+                     models.ResumeParsed.termCounts, models.ResumeParsed.experienceYears,
+                     models.ResumeParsed.educationLevel, models.ResumeParsed.featuresVersion)
+            .join(models.ResumeParsed, models.ResumeParsed.id == latest_parsed_id)
+            .filter(models.Candidate.jobId != job_id, models.Candidate.id > last_id)
+            .order_by(models.Candidate.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        scanned += len(rows)
+
+        chunk = {cid: [parsed_id, keywords or [], term_counts, years, education, version]
+                 for cid, parsed_id, keywords, term_counts, years, education, version in rows}
+        backfill_features(chunk, db)
+        # one transaction per chunk: backfilled rows aren't held (or lost) across the whole pool scan
+        db.commit()
+        candidate_ids = [cid for cid, entry in chunk.items() if entry[2]]
+        if not candidate_ids:
+            continue
+        entries = [chunk[cid] for cid in candidate_ids]
+        scores = score_batch(job, [e[1] for e in entries], [e[2] for e in entries], [e[3] for e in entries],
+                             [e[4] for e in entries], weights, db)
+
+        k = min(top_n, len(candidate_ids))
+        top = np.argpartition(-scores.final, k - 1)[:k]
+        best.extend((float(scores.final[i]), candidate_ids[i], scores.breakdown(i, weights, config_version))
+                    for i in top if scores.final[i] > 0)
+        best = sorted(best, key=lambda item: (-item[0], item[1]))[:top_n]
+
+    try:
+        db.execute(delete(models.TalentSuggestion).where(models.TalentSuggestion.jobId == job_id))
+        if best:
+            db.execute(insert(models.TalentSuggestion), [
+                {"jobId": job_id, "candidateId": cid, "score": score, "scoreBreakdown": breakdown}
+                for score, cid, breakdown in best
+            ])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to save suggestions: {e}")
+
+    logger.info("Matched %d pooled resumes against job %s in %.2fs; %d suggestions",
+                scanned, job_id, time.perf_counter() - started, len(best))
+    return {"job_id": job_id, "scanned": scanned, "suggested": len(best)}
+
+
+def suggest_for_job(job_id: int):
+    """Background task after create_job; opens its own session."""
+    db = SessionLocal()
+    try:
+        match_talent_pool(job_id, db)
+    except Exception:
+        logger.exception("Talent-pool matching failed for job %s", job_id)
+    finally:
+        db.close()
+
+
+def get_suggestions(job_id: int, limit: int, db: Session):
+    suggestions = (
+        db.query(models.TalentSuggestion)
+        .join(models.TalentSuggestion.candidate)
+        .options(contains_eager(models.TalentSuggestion.candidate))
+        .filter(models.TalentSuggestion.jobId == job_id)
+        .order_by(models.TalentSuggestion.score.desc(), models.TalentSuggestion.candidateId)
+        .limit(limit)
+        .all()
+    )
+    if not suggestions and not db.query(models.Job.id).filter(models.Job.id == job_id).first():
+        raise HTTPException(status_code=404, detail="Job not found")
+    return suggestions
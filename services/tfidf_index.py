@@ -0,0 +1,204 @@
+# services/tfidf_index.py
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+from sqlalchemy.orm import Session
+
+from config import settings
+from model import models
+from utils.resume_features import make_vectorizer, tokenize
+
+
+class TfidfIndex:
+    """
+    Global TF-IDF model fitted over every job description and parsed resume,
+    the resumes from their stored term counts (ResumeParsed.termCounts).
+
+    Job vectors are precomputed once per fit, so scoring a resume is a single
+    `transform` plus a sparse dot product. New jobs are transformed with the
+    current vocabulary as soon as they are created, and a job whose description
+    changed is re-transformed on its next use; the model itself is refitted
+    after enough new documents have arrived or the refit interval has passed.
+    Only one thread refits at a time: the others keep scoring with the
+    previous snapshot rather than fitting the same corpus again.
+    """
+
+    def __init__(self, refit_interval: int = settings.TFIDF_REFIT_INTERVAL_SECONDS,
+                 refit_after_docs: int = settings.TFIDF_REFIT_AFTER_DOCS):
+        self.refit_interval = refit_interval
+        self.refit_after_docs = refit_after_docs
+
+        self._lock = threading.Lock()
+        self._refit_lock = threading.Lock()
+        self.vectorizer: Optional[TfidfVectorizer] = None
+        # job id -> (description it was computed from, vector)
+        self.job_vectors: Dict[int, Tuple[str, sp.csr_matrix]] = {}
+        self.fitted_at = 0.0
+        self.pending_docs = 0
+        self._fit_listeners = []
+
+    def on_fit(self, callback):
+        """
+        Register callback(vectorizer, corpus_matrix, jobs), run after every fit
+        with the TF-IDF matrix of the corpus; its first len(jobs) rows are the jobs,
+        given as (job_id, description) pairs.
+        """
+        self._fit_listeners.append(callback)
+
+    # ---------- fitting ----------
+    def fit(self, db: Session, stale: Optional[TfidfVectorizer] = None):
+        """Refit now (waiting for a refit in progress); with `stale`, only if that fit is still current."""
+        with self._refit_lock:
+            if stale is None or self.vectorizer is stale:
+                self._fit(db)
+
+    @staticmethod
+    def _resume_term_counts(db: Session):
+        """Stored term counts of every parsed resume; rows parsed before they existed are tokenized here."""
+        rows = db.query(models.ResumeParsed.id, models.ResumeParsed.termCounts).all()
+        missing = [parsed_id for parsed_id, counts in rows if counts is None]
+        counts_list = [counts for _, counts in rows if counts]
+        for start in range(0, len(missing), 500):
+            texts = db.query(models.ResumeParsed.text).filter(
+                models.ResumeParsed.id.in_(missing[start:start + 500])).all()
+            counts_list.extend(dict(Counter(tokenize(text))) for (text,) in texts if text)
+        return counts_list
+
+    def _fit(self, db: Session):
+        job_rows = db.query(models.Job.id, models.Job.description).all()
+        counts_list = [dict(Counter(tokenize(desc))) for _, desc in job_rows]
+        counts_list += self._resume_term_counts(db)
+
+        # same vocabulary and idf as vectorizer.fit(texts), without re-tokenizing stored resumes
+        vectorizer = make_vectorizer()
+        document_frequency = Counter(term for counts in counts_list for term in counts)
+        if document_frequency:
+            vectorizer.vocabulary_ = {term: i for i, term in enumerate(sorted(document_frequency))}
+            df = np.array([document_frequency[term] for term in sorted(document_frequency)], dtype=np.float64)
+            n = len(counts_list) + int(vectorizer.smooth_idf)
+            vectorizer.idf_ = np.log(n / (df + int(vectorizer.smooth_idf))) + 1
+            matrix = self.vectors_from_counts(vectorizer, counts_list)
+        else:
+            # empty corpus / vocabulary; similarity falls back to 0 until we have data
+            vectorizer = matrix = None
+
+        job_vectors = {}
+        if vectorizer is not None and job_rows:
+            job_vectors = {job_id: (desc or "", matrix[i]) for i, (job_id, desc) in enumerate(job_rows)}
+
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.job_vectors = job_vectors
+            self.fitted_at = time.monotonic()
+            self.pending_docs = 0
+
+        if vectorizer is not None:
+            jobs = [(job_id, desc or "") for job_id, desc in job_rows]
+            for callback in self._fit_listeners:
+                callback(vectorizer, matrix, jobs)
+
+    def needs_refit(self) -> bool:
+        if self.vectorizer is None:
+            return True
+        if self.pending_docs >= self.refit_after_docs:
+            return True
+        return time.monotonic() - self.fitted_at >= self.refit_interval
+
+    def ensure_fitted(self, db: Session):
+        if not self.needs_refit():
+            return
+        # without a model yet there is nothing to fall back on: wait for the refit
+        if not self._refit_lock.acquire(blocking=self.vectorizer is None):
+            return  # another thread is refitting; keep using the current snapshot
+        try:
+            if self.needs_refit():
+                self._fit(db)
+        finally:
+            self._refit_lock.release()
+
+    def invalidate(self):
+        with self._lock:
+            self.vectorizer = None
+            self.job_vectors = {}
+
+    # ---------- incremental updates ----------
+    def add_job(self, job: models.Job):
+        """Called from create_job: vectorize the new job with the current vocabulary."""
+        with self._lock:
+            self.pending_docs += 1
+            if self.vectorizer is not None:
+                description = job.description or ""
+                self.job_vectors[job.id] = (description, self.vectorizer.transform([description]))
+
+    def add_resume(self):
+        """Called from parse_resume: a new document has joined the corpus."""
+        with self._lock:
+            self.pending_docs += 1
+
+    # ---------- scoring ----------
+    def snapshot(self):
+        """Vectorizer and job vectors from the same fit, safe to use while a refit runs."""
+        with self._lock:
+            return self.vectorizer, self.job_vectors
+
+    def job_vector(self, job: models.Job, vectorizer=None, job_vectors=None) -> Optional[sp.csr_matrix]:
+        if vectorizer is None:
+            vectorizer, job_vectors = self.snapshot()
+        if vectorizer is None:
+            return None
+        description = job.description or ""
+        cached = job_vectors.get(job.id)
+        if cached is not None and cached[0] == description:
+            return cached[1]
+        # created in another process, or the description was edited since
+        vec = vectorizer.transform([description])
+        job_vectors[job.id] = (description, vec)
+        return vec
+
+    @staticmethod
+    def vectors_from_counts(vectorizer: TfidfVectorizer, term_counts_list) -> sp.csr_matrix:
+        """
+        TF-IDF rows built from stored term counts (ResumeParsed.termCounts), the
+        same as `vectorizer.transform(texts)` without re-tokenizing the texts.
+        """
+        vocabulary, idf = vectorizer.vocabulary_, vectorizer.idf_
+        indptr, indices, data = [0], [], []
+        for counts in term_counts_list:
+            for term, count in (counts or {}).items():
+                col = vocabulary.get(term)
+                if col is not None:
+                    indices.append(col)
+                    data.append(count * idf[col])
+            indptr.append(len(indices))
+        matrix = sp.csr_matrix((np.asarray(data, dtype=np.float64), indices, indptr),
+                               shape=(len(term_counts_list), len(vocabulary)))
+        matrix.sort_indices()
+        return normalize(matrix, norm=vectorizer.norm, copy=False)
+
+    def similarity_from_counts(self, db: Session, job: models.Job, term_counts: dict) -> float:
+        self.ensure_fitted(db)
+        vectorizer, job_vectors = self.snapshot()
+        if vectorizer is None:
+            return 0.0
+        job_vec = self.job_vector(job, vectorizer, job_vectors)
+        resume_vec = self.vectors_from_counts(vectorizer, [term_counts])
+        return float(resume_vec.multiply(job_vec).sum())
+
+    def similarity(self, db: Session, job: models.Job, text: str) -> float:
+        self.ensure_fitted(db)
+        vectorizer, job_vectors = self.snapshot()
+        if vectorizer is None:
+            return 0.0
+        job_vec = self.job_vector(job, vectorizer, job_vectors)
+        resume_vec = vectorizer.transform([text])
+        # rows are l2-normalised, so the dot product is the cosine similarity
+        return float(resume_vec.multiply(job_vec).sum())
+
+
+tfidf_index = TfidfIndex()
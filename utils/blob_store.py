@@ -0,0 +1,47 @@
+# utils/blob_store.py
+import hashlib
+import os
+import tempfile
+
+from config import settings
+
+
+class BlobStore:
+    """
+    Content-addressed file store.
+
+    Files live at `<root>/<h[0:2]>/<h[2:4]>/<sha256>.<ext>`, so the same resume
+    uploaded several times is written to disk once.
+    """
+
+    def __init__(self, root: str = settings.RESUME_STORE_DIR):
+        self.root = root
+
+    def path_for(self, sha256: str, ext: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], f"{sha256}.{ext}")
+
+    def temp_file(self):
+        os.makedirs(self.root, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=self.root, suffix=".part", delete=False)
+
+    def commit(self, tmp_path: str, sha256: str, ext: str) -> str:
+        """Move a fully written temp file into place (or drop it if already stored)."""
+        path = self.path_for(sha256, ext)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return path
+
+    def put_bytes(self, data: bytes, ext: str):
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.path_for(sha256, ext)
+        if not os.path.exists(path):
+            with self.temp_file() as tmp:
+                tmp.write(data)
+            self.commit(tmp.name, sha256, ext)
+        return sha256, path
+
+
+blob_store = BlobStore()
@@ -0,0 +1,60 @@
+# utils/body_limit.py
+import re
+from typing import List, Pattern, Tuple
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware capping request bodies per path, before the route sees them.
+
+    Routes that take an `UploadFile` only run after Starlette has parsed and
+    spooled the whole multipart body, so a check in the route body comes too
+    late. A Content-Length over the limit is answered with 413 straight away;
+    bodies without one (chunked) are counted as they arrive and the request
+    fails with 413 as soon as the limit is crossed.
+    """
+
+    def __init__(self, app, limits: List[Tuple[str, int]], detail: str = "Request body too large"):
+        self.app = app
+        self.limits: List[Tuple[Pattern, int]] = [(re.compile(pattern), limit) for pattern, limit in limits]
+        self.detail = detail
+
+    def _limit(self, path: str):
+        for pattern, limit in self.limits:
+            if pattern.fullmatch(path):
+                return limit
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limit = self._limit(scope["path"])
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                content_length = int(content_length)
+            except ValueError:
+                return await JSONResponse({"detail": "Invalid Content-Length header"}, status_code=400)(
+                    scope, receive, send)
+            if content_length > limit:
+                return await JSONResponse({"detail": self.detail}, status_code=413)(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # raised inside the body parser; FastAPI passes HTTPException through
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
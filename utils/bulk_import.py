@@ -0,0 +1,52 @@
+# utils/bulk_import.py
+import codecs
+import csv
+import json
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    return None
+
+
+def iter_rows(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row number, row dict, parse error) from a CSV (with header) or NDJSON
+    byte stream, decoding incrementally so the file is never held in memory.
+    Row numbers are 1-based data rows; blank lines are skipped.
+    """
+    lines = codecs.getreader("utf-8-sig")(stream, errors="replace")
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for number, row in enumerate(reader, 1):
+            if None in row:
+                yield number, None, "More values than header columns"
+                continue
+            # empty cells mean "not given"
+            yield number, {k.strip(): (v.strip() or None) if isinstance(v, str) else v
+                           for k, v in row.items() if k}, None
+    elif fmt == "ndjson":
+        number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield number, None, "Expected a JSON object"
+                continue
+            yield number, row, None
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
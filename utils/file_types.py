@@ -0,0 +1,35 @@
+# utils/file_types.py
+import zipfile
+from typing import Optional, Tuple
+
+# (magic prefix, extension, mimetype)
+SIGNATURES = [
+    (b"%PDF-", "pdf", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "png", "image/png"),
+    (b"\xff\xd8\xff", "jpg", "image/jpeg"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "doc", "application/msword"),
+    (b"PK\x03\x04", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+]
+
+# longest signature we need to look at
+SNIFF_BYTES = max(len(sig) for sig, _, _ in SIGNATURES)
+
+
+def sniff_file_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """
+    Detect (extension, mimetype) from the first bytes of a file.
+    Returns None for anything we don't accept as a resume.
+    """
+    for signature, ext, mimetype in SIGNATURES:
+        if head.startswith(signature):
+            return ext, mimetype
+    return None
+
+
+def is_docx(path: str) -> bool:
+    # every zip starts with PK\x03\x04, so confirm it is really a Word document
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return "word/document.xml" in zf.namelist()
+    except zipfile.BadZipFile:
+        return False
@@ -0,0 +1,100 @@
+# utils/keyword_matcher.py
+from collections import Counter, deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+# Characters that make up a "word" for boundary checks. "+" and "#" are
+# included so that "c" does not match inside "c++" or "c#".
+WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_+#")
+
+
+class KeywordMatch(NamedTuple):
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+
+    The automaton is built once and then finds every keyword in a single pass
+    over the text. Matching is case-insensitive and only reports hits that sit
+    on word boundaries, so "go" does not match inside "google".
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        # keep first-seen order, drop duplicates
+        self.keywords: List[str] = list(dict.fromkeys(kw.lower() for kw in keywords if kw))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for kw in self.keywords:
+            self._add(kw)
+        self._build_failure_links()
+
+    def _add(self, keyword: str):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(keyword)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # some unicode characters expand when lowercased; keep offsets aligned
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(lowered)
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            after_ok = end == n or lowered[end] not in WORD_CHARS
+            for kw in out[state]:
+                start = end - len(kw)
+                before_ok = start == 0 or lowered[start - 1] not in WORD_CHARS
+                if before_ok and after_ok:
+                    yield KeywordMatch(kw, start, end)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        return list(self.iter_matches(text))
+
+    def count(self, text: str) -> Dict[str, int]:
+        return dict(Counter(m.keyword for m in self.iter_matches(text)))
+
+    def positions(self, text: str) -> Dict[str, List[int]]:
+        result: Dict[str, List[int]] = {}
+        for m in self.iter_matches(text):
+            result.setdefault(m.keyword, []).append(m.start)
+        return result
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct matched keywords, in the order they were registered."""
+        found = {m.keyword for m in self.iter_matches(text)}
+        return [kw for kw in self.keywords if kw in found]
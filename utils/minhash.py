@@ -0,0 +1,58 @@
+# utils/minhash.py
+import re
+import zlib
+from functools import lru_cache
+from typing import Optional, Set, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+_PRIME = (1 << 31) - 1  # a * h + b stays below 2**62, so uint64 arithmetic never overflows
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashes of the overlapping `size`-word shingles of the lower-cased text."""
+    words = _WORD.findall((text or "").lower())
+    if not words:
+        return set()
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())}
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+@lru_cache(maxsize=None)
+def _permutations(num_perm: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def signature(shingle_hashes: Set[int], num_perm: int = 128) -> Optional[np.ndarray]:
+    """MinHash signature (uint32, one min-hash per permutation); None for an empty set."""
+    if not shingle_hashes:
+        return None
+    h = np.fromiter(shingle_hashes, dtype=np.uint64, count=len(shingle_hashes)) & np.uint64(_PRIME)
+    a, b = _permutations(num_perm)
+    return ((a * h + b) % np.uint64(_PRIME)).min(axis=1).astype(np.uint32)
+
+
+def similarity(sig: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of one signature to each row of `others`."""
+    return (others == sig).mean(axis=-1)
+
+
+def lsh_params(num_perm: int, threshold: float, recall: float = 0.95) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows == num_perm: the most rows per band (fewest
+    false candidates) for which a pair at `threshold` still shares a bucket
+    with probability >= `recall`, i.e. 1 - (1 - threshold**rows)**bands.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
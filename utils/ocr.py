@@ -0,0 +1,200 @@
+# utils/ocr.py
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pytesseract
+from PIL import Image, ImageOps
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# every pytesseract call spawns a tesseract process; this caps how many run at
+# once. OCR runs in the resume-worker and PDF page pools, so the semaphore is a
+# multiprocessing one created in the server process and handed to each pool's
+# processes by init_ocr_worker. Separate server processes (uvicorn --workers)
+# each get their own OCR_MAX_PROCESSES.
+_tesseract_slots = None
+_tesseract_slots_lock = threading.Lock()
+
+
+def tesseract_slots():
+    global _tesseract_slots
+    with _tesseract_slots_lock:
+        if _tesseract_slots is None:
+            _tesseract_slots = multiprocessing.BoundedSemaphore(max(1, settings.OCR_MAX_PROCESSES))
+        return _tesseract_slots
+
+
+def init_ocr_worker(slots):
+    """Process-pool initializer: share the parent's Tesseract slots (pass tesseract_slots())."""
+    global _tesseract_slots
+    _tesseract_slots = slots
+
+
+class OcrResult(NamedTuple):
+    text: str
+    timings: Dict[str, float]  # seconds per stage
+    cached: bool
+
+
+def merge_timings(into: Optional[Dict[str, float]], timings: Dict[str, float]):
+    """
+    Add one OCR run's stage timings to a caller's totals (None: not collecting).
+    OCR usually runs in worker processes, so callers return the totals to the
+    parent, which records them (utils.metrics.record_stage).
+    """
+    if into is not None:
+        for stage, seconds in timings.items():
+            into[stage] = into.get(stage, 0.0) + seconds
+
+
+# ---------- preprocessing ----------
+def normalize_resolution(image: Image.Image) -> Image.Image:
+    # resample to OCR_TARGET_DPI when the image says what it was taken at,
+    # and never hand Tesseract anything larger than OCR_MAX_DIMENSION
+    scale = 1.0
+    dpi = image.info.get("dpi")
+    if dpi and dpi[0]:
+        scale = settings.OCR_TARGET_DPI / float(dpi[0])
+    longest = max(image.size) * scale
+    if longest > settings.OCR_MAX_DIMENSION:
+        scale *= settings.OCR_MAX_DIMENSION / longest
+    if abs(scale - 1.0) < 0.05:
+        return image
+    size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    return image.resize(size, Image.LANCZOS)
+
+
+def _profile_score(image: Image.Image, angle: float) -> float:
+    rotated = image.rotate(angle, resample=Image.BILINEAR, fillcolor=255)
+    profile = (np.asarray(rotated) < 128).sum(axis=1).astype(np.float64)
+    # sharp row-to-row changes mean text lines are aligned with the rows
+    return float(np.sum(np.diff(profile) ** 2))
+
+
+def estimate_skew(gray: Image.Image) -> float:
+    """Angle (degrees) that makes text lines horizontal, via projection profiles."""
+    small = gray.copy()
+    small.thumbnail((600, 600))
+    max_angle = settings.OCR_DESKEW_MAX_ANGLE
+
+    # coarse 1 degree sweep, then refine around the best angle
+    coarse = np.arange(-max_angle, max_angle + 0.5, 1.0)
+    best = max(coarse, key=lambda a: _profile_score(small, float(a)))
+    fine = [best - 0.5, best, best + 0.5]
+    return float(max(fine, key=lambda a: _profile_score(small, float(a))))
+
+
+def crop_margins(gray: Image.Image, padding: int = 10) -> Image.Image:
+    ink = gray.point(lambda p: 255 if p < 200 else 0)
+    bbox = ink.getbbox()
+    if not bbox:
+        return gray
+    left, top, right, bottom = bbox
+    return gray.crop((max(0, left - padding), max(0, top - padding),
+                      min(gray.width, right + padding), min(gray.height, bottom + padding)))
+
+
+def preprocess(image: Image.Image, timings: Dict[str, float]) -> Image.Image:
+    start = time.perf_counter()
+    image = ImageOps.exif_transpose(image)
+    image = normalize_resolution(image)
+    timings["resize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    gray = image.convert("L")
+    timings["grayscale"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    angle = estimate_skew(gray)
+    if angle:
+        gray = gray.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    timings["deskew"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    gray = crop_margins(gray)
+    timings["crop"] = time.perf_counter() - start
+    return gray
+
+
+# ---------- cache ----------
+def _cache_path(key: str) -> str:
+    return os.path.join(settings.OCR_CACHE_DIR, key[:2], f"{key}.txt")
+
+
+def _cache_get(key: str) -> Optional[str]:
+    path = _cache_path(key)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    return None
+
+
+def _cache_put(key: str, text: str):
+    path = _cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ---------- OCR ----------
+def ocr_pil_image(image: Image.Image, cache_key: Optional[str] = None) -> OcrResult:
+    timings: Dict[str, float] = {}
+    total_start = time.perf_counter()
+
+    if cache_key:
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            timings["total"] = time.perf_counter() - total_start
+            return OcrResult(cached, timings, True)
+
+    prepared = preprocess(image, timings)
+
+    start = time.perf_counter()
+    with tesseract_slots():
+        text = pytesseract.image_to_string(prepared)
+    timings["tesseract"] = time.perf_counter() - start
+
+    if cache_key:
+        _cache_put(cache_key, text)
+
+    timings["total"] = time.perf_counter() - total_start
+    logger.debug("ocr timings: %s", {k: round(v, 4) for k, v in timings.items()})
+    return OcrResult(text, timings, False)
+
+
+def ocr_image(file_path: str) -> OcrResult:
+    start = time.perf_counter()
+    with open(file_path, "rb") as f:
+        data = f.read()
+    key = hashlib.sha256(data).hexdigest()
+    load_seconds = time.perf_counter() - start
+
+    cached = _cache_get(key)
+    if cached is not None:
+        return OcrResult(cached, {"load": load_seconds, "total": load_seconds}, True)
+
+    with Image.open(file_path) as image:
+        image.load()
+        result = ocr_pil_image(image, cache_key=key)
+    result.timings["load"] = load_seconds
+    result.timings["total"] += load_seconds
+    return result
+
+
+def ocr_images(file_paths: List[str]) -> List[OcrResult]:
+    """OCR several images concurrently; Tesseract processes stay within the shared OCR_MAX_PROCESSES slots."""
+    if len(file_paths) <= 1:
+        return [ocr_image(p) for p in file_paths]
+    with ThreadPoolExecutor(max_workers=min(len(file_paths), max(1, settings.OCR_MAX_PROCESSES))) as pool:
+        return list(pool.map(ocr_image, file_paths))
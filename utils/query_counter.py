@@ -0,0 +1,112 @@
+# utils/query_counter.py
+import contextvars
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+        self.active = True
+
+    def add(self, statement: str):
+        if not self.active:
+            return
+        self.count += 1
+        self.statements.append(statement)
+
+
+# one counter per request / `count_queries()` block; threadpool workers see the
+# same object because starlette copies the context into the worker thread
+_current = contextvars.ContextVar("query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None:
+        counter.add(statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    Count the SQL statements executed inside the block (every engine, sync or async).
+
+        with count_queries() as q:
+            client.get("/candidates/1")
+        assert q.count == 2, q.statements
+    """
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(counter.statements, 1))
+        raise AssertionError(f"expected at most {limit} SQL statements, got {counter.count}:\n{listing}")
+
+
+class RouteQueryStats:
+    """Statements per request, aggregated by route template (e.g. /candidates/{candidate_id})."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route: str, count: int):
+        with self._lock:
+            requests, total, worst = self._routes.get(route, (0, 0, 0))
+            self._routes[route] = (requests + 1, total + count, max(worst, count))
+
+    def report(self):
+        with self._lock:
+            items = sorted(self._routes.items())
+        return {
+            route: {"requests": n, "queries_total": total, "queries_avg": round(total / n, 2), "queries_max": worst}
+            for route, (n, total, worst) in items
+        }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_query_stats = RouteQueryStats()
+
+
+class QueryCountMiddleware:
+    """ASGI middleware feeding `route_query_stats` with the statement count of every HTTP request."""
+
+    def __init__(self, app, stats: RouteQueryStats = route_query_stats):
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        with count_queries() as counter:
+            async def send_wrapper(message):
+                await send(message)
+                if message["type"] == "http.response.body" and not message.get("more_body", False):
+                    # background tasks run after this; they are not part of the request
+                    counter.active = False
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                # raw paths of unmatched requests would grow the report without bound
+                path = getattr(route, "path", None) or "<unmatched>"
+                self.stats.record(f"{scope['method']} {path}", counter.count)
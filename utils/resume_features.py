@@ -0,0 +1,190 @@
+# utils/resume_features.py
+import re
+from collections import Counter
+from datetime import date
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# bump when extraction changes; rows with an older version are recomputed on next use
+FEATURES_VERSION = 1
+
+
+def make_vectorizer() -> TfidfVectorizer:
+    """The TF-IDF vectorizer configuration; stored term counts use its analyzer."""
+    return TfidfVectorizer(stop_words="english")
+
+
+# lowercases, tokenizes and drops stop words exactly like the TF-IDF index
+_analyze = make_vectorizer().build_analyzer()
+
+
+def tokenize(text: str):
+    return _analyze(text or "")
+
+
+# ---------- experience ----------
+_YEARS_RE = re.compile(
+    r"(?<![\d.])(\d{1,2}(?:\.\d+)?)\s*\+?\s*"
+    r"(?:(?:-|–|—|to)\s*(\d{1,2}(?:\.\d+)?)\s*\+?\s*)?"
+    r"(?:years?|yrs?)\b"
+)
+
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+_MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+
+
+def _date(prefix: str) -> str:
+    return (rf"(?:(?P<{prefix}_mon>{_MONTH})\s+|(?P<{prefix}_num>0?[1-9]|1[0-2])\s*[/.-]\s*)?"
+            rf"(?P<{prefix}_year>(?:19|20)\d{{2}})")
+
+
+_SPAN_RE = re.compile(
+    _date("start") + r"\s*(?:-|–|—|to|until|till)\s*"
+    r"(?:" + _date("end") + r"|(?P<ongoing>present|current|now|today|date))\b"
+)
+
+MAX_EXPERIENCE_YEARS = 50
+
+
+def _month_index(match, prefix: str) -> int:
+    year = int(match.group(f"{prefix}_year"))
+    if match.group(f"{prefix}_mon"):
+        month = _MONTHS[match.group(f"{prefix}_mon")[:3]]
+    elif match.group(f"{prefix}_num"):
+        month = int(match.group(f"{prefix}_num"))
+    else:
+        month = 1
+    return year * 12 + month - 1
+
+
+def _span_years(lowered: str, today: date) -> float:
+    intervals = []
+    for m in _SPAN_RE.finditer(lowered):
+        start = _month_index(m, "start")
+        if m.group("ongoing"):
+            end = today.year * 12 + today.month - 1
+        else:
+            end = _month_index(m, "end")
+            # "Jan 2019 - Dec 2019" is twelve months, "2019 - 2021" is two years
+            if m.group("end_mon") or m.group("end_num"):
+                end += 1
+        if start < end <= start + MAX_EXPERIENCE_YEARS * 12:
+            intervals.append((start, end))
+
+    # overlapping jobs count once
+    months, current_start, current_end = 0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return months / 12
+
+
+def extract_experience_years(text: str, today: date = None, sections=None) -> float:
+    """
+    Years of experience: the largest explicit claim ("5 years", "3-5 yrs" counts
+    as 5, "7+ years") or the total of the employment date spans
+    ("Jan 2018 - Present", "2015 – 2019", "03/2016 to 08/2017"), whichever is larger.
+    Date spans are only read from the experience section when there is one, so
+    study years don't count.
+    """
+    text = text or ""
+    lowered = text.lower()
+    stated = 0.0
+    for low, high in _YEARS_RE.findall(lowered):
+        value = float(high or low)
+        if value <= MAX_EXPERIENCE_YEARS:
+            stated = max(stated, value)
+
+    if sections is None:
+        sections = split_sections(text)
+    if "experience" in sections:
+        start, end = sections["experience"]
+        lowered = lowered[start:end]
+    spans = _span_years(lowered, today or date.today())
+    return round(min(max(stated, spans), MAX_EXPERIENCE_YEARS), 1)
+
+
+# ---------- education ----------
+EDUCATION_LEVELS = ("high_school", "associate", "bachelor", "master", "phd")
+
+_EDUCATION_PATTERNS = [
+    ("phd", re.compile(r"\b(?:ph\.?\s?d|doctorate|doctor of philosophy|d\.phil)\b")),
+    ("master", re.compile(r"\b(?:masters?|master's|m\.?\s?sc|m\.?\s?tech|mba|mca|m\.s\.|m\.e\.|m\.a\.|post\s?graduate)\b")),
+    ("bachelor", re.compile(r"\b(?:bachelors?|bachelor's|b\.?\s?sc|b\.?\s?tech|b\.?\s?eng|bca|bba|b\.s\.|b\.e\.|b\.a\.|undergraduate)\b")),
+    ("associate", re.compile(r"\bassociate(?:'s)? (?:degree|of)\b")),
+    ("high_school", re.compile(r"\b(?:high school|secondary school|hsc|ssc|ged|diploma|12th)\b")),
+]
+
+
+def extract_education_level(text: str):
+    """Highest degree mentioned, one of EDUCATION_LEVELS, or None."""
+    lowered = (text or "").lower()
+    for level, pattern in _EDUCATION_PATTERNS:
+        if pattern.search(lowered):
+            return level
+    return None
+
+
+def education_score(level, required: str) -> float:
+    """1 when `level` meets the `required` one, partial credit below it, 0 when no degree was found."""
+    if level not in EDUCATION_LEVELS:
+        return 0.0
+    return min(1.0, (EDUCATION_LEVELS.index(level) + 1) / (EDUCATION_LEVELS.index(required) + 1))
+
+
+# ---------- sections ----------
+_SECTION_NAMES = {
+    "summary": ("summary", "profile", "objective", "about me", "professional summary", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history"),
+    "education": ("education", "academic background", "academics", "qualifications", "education and training"),
+    "skills": ("skills", "technical skills", "core competencies", "key skills", "technologies"),
+    "projects": ("projects", "personal projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications"),
+    "awards": ("awards", "achievements", "honors"),
+    "publications": ("publications",),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies"),
+}
+_HEADERS = {alias: name for name, aliases in _SECTION_NAMES.items() for alias in aliases}
+_HEADER_RE = re.compile(r"^[ \t]*([A-Za-z& ]{3,40}?)[ \t]*:?[ \t]*$", re.MULTILINE)
+
+
+def split_sections(text: str):
+    """
+    {section: [start, end]} character offsets of each section body, found from
+    header lines such as "Work Experience" or "SKILLS:". First occurrence wins.
+    """
+    headers = []
+    for m in _HEADER_RE.finditer(text or ""):
+        name = _HEADERS.get(" ".join(m.group(1).lower().replace("&", "and").split()))
+        if name:
+            headers.append((name, m.start(), m.end()))
+
+    sections = {}
+    for i, (name, _, start) in enumerate(headers):
+        end = headers[i + 1][1] if i + 1 < len(headers) else len(text)
+        if name not in sections:
+            sections[name] = [start, end]
+    return sections
+
+
+# ResumeParsed columns written from extract_features
+FEATURE_COLUMNS = ("termCounts", "experienceYears", "educationLevel", "featuresVersion")
+
+
+def extract_features(text: str):
+    """All precomputed features of a parsed resume, keyed by ResumeParsed column name."""
+    return {
+        "termCounts": dict(Counter(tokenize(text))),
+        "experienceYears": extract_experience_years(text),
+        "educationLevel": extract_education_level(text),
+        "featuresVersion": FEATURES_VERSION,
+    }
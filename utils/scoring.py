@@ -8,8 +8,10 @@ def tokenize(text):
     words = re.findall(r'\b[a-zA-Z]{2,}\b', text.lower())
     return [w for w in words if w not in STOPWORDS]
 
-def compute_tfidf_similarity(doc1, doc2):
-    tokens1, tokens2 = tokenize(doc1), tokenize(doc2)
+def compute_tfidf_similarity(doc1, doc2, tokens1=None, tokens2=None):
+    # pass already tokenized documents to skip re-tokenizing them
+    tokens1 = tokenize(doc1) if tokens1 is None else tokens1
+    tokens2 = tokenize(doc2) if tokens2 is None else tokens2
     all_words = set(tokens1 + tokens2)
     tf1, tf2 = Counter(tokens1), Counter(tokens2)
     dot = sum(tf1[w] * tf2[w] for w in all_words)
@@ -23,9 +25,10 @@ def score_resume(resume_text, candidateId):
     keywords = ["react", "nestjs", "developer", "typescript"]
 
     tokens = tokenize(resume_text)
-    matched = [k for k in keywords if k in tokens]
+    token_set = set(tokens)
+    matched = [k for k in keywords if k in token_set]
     keyword_score = min(1, len(matched) / len(keywords))
-    tfidf_score = compute_tfidf_similarity(job_description, resume_text)
+    tfidf_score = compute_tfidf_similarity(job_description, resume_text, tokens2=tokens)
 
     # Dummy experience extraction
     exp_match = re.search(r'(\d+)\s*years?', resume_text.lower())
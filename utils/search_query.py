@@ -0,0 +1,58 @@
+# utils/search_query.py
+import re
+from typing import List, Tuple
+
+# -"a phrase" / "a phrase" / a single word (possibly -word, OR)
+_TOKEN = re.compile(r'(-?)"([^"]*)"?|(\S+)')
+_WORD = re.compile(r"\w+")
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """
+    Parse web-search style syntax, the same grammar Postgres' websearch_to_tsquery accepts:
+
+        python "machine learning" -php      all of python and the phrase, without php
+        react OR vue                        either term
+
+    Returns (required, excluded): required is a list of OR-groups that must all
+    match, each entry a lower-cased phrase of one or more words.
+    """
+    required: List[List[str]] = []
+    excluded: List[str] = []
+    pending_or = False
+    for match in _TOKEN.finditer(query or ""):
+        negated, phrase, word = match.groups()
+        if word is not None:
+            if word == "OR":
+                pending_or = bool(required)
+                continue
+            if word == "AND":
+                continue
+            negated, phrase = ("-" if word.startswith("-") else ""), word.lstrip("-")
+        words = _WORD.findall(phrase.lower())
+        if not words:
+            continue
+        phrase = " ".join(words)
+        if negated:
+            excluded.append(phrase)
+        elif pending_or:
+            required[-1].append(phrase)
+        else:
+            required.append([phrase])
+        pending_or = False
+    return required, excluded
+
+
+def to_fts5(query: str) -> str:
+    """Translate a search query into an SQLite FTS5 MATCH expression. Raises ValueError when nothing is required."""
+    required, excluded = parse_query(query)
+    if not required:
+        raise ValueError("Search query needs at least one term to match")
+    groups = []
+    for group in required:
+        quoted = [f'"{phrase}"' for phrase in group]
+        groups.append(quoted[0] if len(quoted) == 1 else "(" + " OR ".join(quoted) + ")")
+    expression = " AND ".join(groups)
+    for phrase in excluded:
+        expression = f'({expression}) NOT "{phrase}"'
+    return expression
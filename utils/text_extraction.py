@@ -1,29 +1,158 @@
+import hashlib
+import multiprocessing.util
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from PIL import Image
 import pytesseract
 import fitz
 from docx import Document
 import io
 
-def extract_text(file_path):
+from config import settings
+from utils.ocr import init_ocr_worker, merge_timings, ocr_image, ocr_pil_image, tesseract_slots
+
+
+# shared by every large PDF extracted in this process; created on first use
+_page_pool = None
+_page_pool_lock = threading.Lock()
+# CPU slots shared by the processes of a pool that extracts documents in
+# parallel (the resume worker's); None elsewhere. See extract_pdf_text.
+_cpu_slots = None
+
+
+def share_cpu_slots(slots):
+    """
+    Process-pool initializer hook: `slots` is a multiprocessing semaphore with
+    one slot per pool process. Each document holds one (cpu_slot()); large PDFs
+    borrow idle ones for their page ranges.
+    """
+    global _cpu_slots
+    _cpu_slots = slots
+    # pool processes exit through multiprocessing, which joins child processes:
+    # stop our page pool first or its idle workers keep the process alive (ahead
+    # of the priority-10 finalizers that close the pool's queues)
+    multiprocessing.util.Finalize(None, shutdown_page_pool, exitpriority=100)
+
+
+@contextmanager
+def cpu_slot():
+    """Hold one shared CPU slot (if this process has any) while extracting a document."""
+    if _cpu_slots is None:
+        yield
+        return
+    with _cpu_slots:
+        yield
+
+
+def _get_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=max(2, settings.PDF_EXTRACT_WORKERS),
+                                             initializer=init_ocr_worker, initargs=(tesseract_slots(),))
+        return _page_pool
+
+
+def shutdown_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=True)
+            _page_pool = None
+
+
+def _ocr_page(page, ocr_timings):
+    # page has no text layer (scanned PDF); render it and run Tesseract
+    pix = page.get_pixmap(dpi=settings.PDF_OCR_DPI)
+    image = Image.frombytes("RGB" if pix.n < 4 else "RGBA", (pix.width, pix.height), pix.samples)
+    image.info["dpi"] = (settings.PDF_OCR_DPI, settings.PDF_OCR_DPI)
+    try:
+        result = ocr_pil_image(image, cache_key=hashlib.sha256(pix.samples).hexdigest())
+    except pytesseract.TesseractNotFoundError:
+        return ""
+    merge_timings(ocr_timings, result.timings)
+    return result.text
+
+
+def _extract_page_range(file_path, start, stop):
+    """Texts of pages [start, stop) and the OCR stage timings they took."""
+    texts, ocr_timings = [], {}
+    with fitz.open(file_path) as pdf:
+        for number in range(start, stop):
+            page = pdf[number]
+            page_text = page.get_text("text")
+            if not page_text.strip():
+                page_text = _ocr_page(page, ocr_timings)
+            texts.append(page_text)
+    return texts, ocr_timings
+
+
+def extract_pdf_text(file_path, parallel_threshold=None, workers=None, ocr_timings=None):
+    """
+    Extract text page by page. Documents with at least `parallel_threshold`
+    pages are split into page ranges and extracted across a shared process
+    pool; pages without a text layer fall back to OCR, whose stage timings
+    are added to `ocr_timings` if given.
+
+    In the resume worker's processes (share_cpu_slots) the page ranges only
+    use CPU slots no other document is holding: the caller's own slot plus
+    any idle ones it can take without waiting, up to `workers`. A large PDF
+    arriving at an idle worker is spread over the free cores, while under
+    load it is extracted serially, so running processes never exceed the
+    worker's concurrency. The trade-off is that each worker process keeps its
+    own page pool, whose idle processes cost memory (at most
+    PDF_EXTRACT_WORKERS per worker process) though never CPU beyond the slots.
+    """
+    parallel_threshold = parallel_threshold or settings.PDF_PARALLEL_PAGE_THRESHOLD
+    workers = workers or settings.PDF_EXTRACT_WORKERS
+
+    with fitz.open(file_path) as pdf:
+        page_count = pdf.page_count
+
+    borrowed = 0
+    if page_count >= parallel_threshold and workers >= 2 and _cpu_slots is not None:
+        while borrowed < workers - 1 and _cpu_slots.acquire(block=False):
+            borrowed += 1
+        workers = borrowed + 1
+
+    try:
+        if page_count < parallel_threshold or workers < 2:
+            texts, timings = _extract_page_range(file_path, 0, page_count)
+            merge_timings(ocr_timings, timings)
+            return "".join(texts)
+
+        chunk = -(-page_count // workers)  # ceil division
+        starts = list(range(0, page_count, chunk))
+        stops = [min(start + chunk, page_count) for start in starts]
+        results = list(_get_page_pool().map(_extract_page_range, [file_path] * len(starts), starts, stops))
+        for _, timings in results:
+            merge_timings(ocr_timings, timings)
+        # join once, in page order
+        return "".join(text for texts, _ in results for text in texts)
+    finally:
+        for _ in range(borrowed):
+            _cpu_slots.release()
+
+
+def extract_text(file_path, ocr_timings=None):
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext == '.pdf':
-        text = ""
-        pdf = fitz.open(file_path)
-        for page in pdf:
-            text += page.get_text("text")
-        return text
+        return extract_pdf_text(file_path, ocr_timings=ocr_timings)
 
     elif ext == '.docx':
         doc = Document(file_path)
         return "\n".join([p.text for p in doc.paragraphs])
 
     elif ext in ['.png', '.jpg', '.jpeg']:
-        return pytesseract.image_to_string(Image.open(file_path))
+        result = ocr_image(file_path)
+        merge_timings(ocr_timings, result.timings)
+        return result.text
 
     else:
         return "Unsupported file format."
 
-file = r"C:/Users/pc/Desktop/TestAI/assets/im.jpg"  # or .docx or .jpg
-print(extract_text(file))
+# file = r"C:/Users/pc/Desktop/TestAI/assets/im.jpg"  # or .docx or .jpg
+# print(extract_text(file))